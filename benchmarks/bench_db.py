@@ -0,0 +1,100 @@
+"""Compares the command-path query cost of per-call aiosqlite.connect() against the pooled Database.
+
+Run from the repository root:  python -m benchmarks.bench_db [iterations] [concurrency]
+"""
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import aiosqlite
+
+from core.database import Database
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------------------------------------------------
+COLOUR_SQL = 'SELECT value FROM customisation WHERE type = ? AND guild_id = ?'
+PERMISSION_SQL = 'SELECT can_use_commands FROM permissions WHERE guild_id = ? AND user_id = ?'
+
+
+async def seed(path, guilds=1000):
+    async with aiosqlite.connect(path) as conn:
+        await conn.execute('''
+            CREATE TABLE customisation (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                guild_id INTEGER NOT NULL,
+                type TEXT NOT NULL,
+                value TEXT NOT NULL,
+                UNIQUE(guild_id, type)
+            )
+        ''')
+        await conn.execute('''
+            CREATE TABLE permissions (
+                guild_id INTEGER,
+                user_id INTEGER,
+                can_use_commands BOOLEAN DEFAULT 0,
+                PRIMARY KEY (guild_id, user_id)
+            )
+        ''')
+        await conn.executemany('INSERT INTO customisation (guild_id, type, value) VALUES (?, ?, ?)',
+                               [(g, "embed_color", "c4a7ec") for g in range(guilds)])
+        await conn.executemany('INSERT INTO permissions (guild_id, user_id, can_use_commands) VALUES (?, ?, 1)',
+                               [(g, g * 7, ) for g in range(guilds)])
+        await conn.commit()
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Command Paths
+# ---------------------------------------------------------------------------------------------------------------------
+async def command_path_connect(path, n):
+    """What a slash command cost before: one connection per helper call."""
+    for query, params in ((COLOUR_SQL, ("embed_color", n % 1000)), (PERMISSION_SQL, (n % 1000, n * 7))):
+        async with aiosqlite.connect(path) as conn:
+            async with conn.execute(query, params) as cursor:
+                await cursor.fetchone()
+
+
+async def command_path_pooled(db, n):
+    await db.fetchone(COLOUR_SQL, ("embed_color", n % 1000))
+    await db.fetchone(PERMISSION_SQL, (n % 1000, n * 7))
+
+
+async def run(label, path_fn, iterations, concurrency):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(n):
+        async with semaphore:
+            started = time.perf_counter()
+            await path_fn(n)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(iterations)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{label:<10} {iterations / elapsed:>9.0f} cmd/s   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+
+
+async def main(iterations=2000, concurrency=16):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        await seed(path)
+
+        await run("connect", lambda n: command_path_connect(path, n), iterations, concurrency)
+
+        db = Database(path)
+        await db.open()
+        try:
+            await run("pooled", lambda n: command_path_pooled(db, n), iterations, concurrency)
+        finally:
+            await db.close()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*args))
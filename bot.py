@@ -1,8 +1,11 @@
-import os
 import discord
 import asyncio
 import logging
-from config import client, DISCORD_TOKEN, perform_sync, TEST_GUILD_ID
+from datetime import datetime
+from config import client, DISCORD_TOKEN, perform_sync, TEST_GUILD_ID, LAUNCH_TIME, INSTRUMENT_LOOP
+from core.loader import load_extensions, resolve_manifest
+from core.schema import migrate
+from core.maintenance import analyze
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +16,9 @@ logger = logging.getLogger(__name__)
 @client.event
 async def on_ready():
     logger.info(f"Bot logged in as {client.user} (ID: {client.user.id})")
+    if not hasattr(client, "ready_after"):
+        client.ready_after = (datetime.utcnow() - LAUNCH_TIME).total_seconds()
+        logger.info(f"Time to first ready: {client.ready_after:.2f}s")
 
     if TEST_GUILD_ID and not hasattr(client, "synced"):
         try:
@@ -29,10 +35,19 @@ async def on_ready():
 @client.event
 async def on_guild_join(guild: discord.Guild):
     try:
-        await perform_sync(guild=guild)
-        logger.info(f"Auto-synced commands to new guild: {guild.name} ({guild.id})")
+        client.sync_engine.schedule_join(guild)
+        logger.debug(f"Queued command sync for new guild: {guild.name} ({guild.id})")
     except Exception as e:
-        logger.exception(f"Failed to sync on guild join for {guild.id}: {e}")
+        logger.exception(f"Failed to queue sync on guild join for {guild.id}: {e}")
+
+
+@client.event
+async def on_guild_remove(guild: discord.Guild):
+    # Discord drops a guild's commands when the bot leaves, so the stored fingerprint no longer holds
+    try:
+        await client.db.execute('DELETE FROM sync_state WHERE scope = ?', (str(guild.id),))
+    except Exception as e:
+        logger.exception(f"Failed to clear sync state for removed guild {guild.id}: {e}")
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -40,19 +55,41 @@ async def on_guild_join(guild: discord.Guild):
 # ---------------------------------------------------------------------------------------------------------------------
 async def main():
     try:
-        await client.load_extension("core.initialisation")
-        logger.info("Loaded core.initialisation")
+        await client.db.open()
+        await migrate(client.db)
+        await analyze(client.db)
+        await client.catalogue.load()
+        await client.stats.load()
+        await client.blacklist.load()
+        await client.suggestions.load()
+
+        await load_extensions(client, resolve_manifest())
 
-        for filename in os.listdir("cogs"):
-            if filename.endswith(".py"):
-                await client.load_extension(f"cogs.{filename[:-3]}")
-                logger.info(f"Loaded cog: {filename[:-3]}")
+        await client.settings.preload()
+        client.audit.start()
+        client.suggestions.start()
+        client.sampler.start()
+        if INSTRUMENT_LOOP:
+            client.loop_monitor.install()
+        await client.metrics_exporter.start()
+        client.backups.start()
 
         logger.info("Starting bot...")
         await client.start(DISCORD_TOKEN)
 
     except Exception as e:
         logger.exception(f"Unhandled exception during startup: {e}")
+    finally:
+        await client.backups.stop()
+        await client.metrics_exporter.stop()
+        await client.sampler.stop()
+        await client.suggestions.stop()
+        await client.audit.stop()
+        await client.fetcher.close()
+        if not client.is_closed():
+            await client.close()
+        logger.info(f"Settings cache: {client.settings.stats()}")
+        await client.db.close()
 
 
 if __name__ == "__main__":
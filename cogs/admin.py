@@ -1,19 +1,24 @@
+import os
 import discord
-import aiosqlite
 import logging
 
 from discord import app_commands
 from discord.ext import commands
-from config import client, perform_sync
+from config import client
 
-from core.utils import log_command_usage, DB_PATH, only_owner, owner_check
-from core.autocomplete import table_name_autocomplete, cog_autocomplete
+from core.utils import log_command_usage, only_owner, owner_check
+from core.autocomplete import table_name_autocomplete, cog_autocomplete, snapshot_autocomplete
+from core.catalogue import quote_identifier
+from core.maintenance import clear_table, recreate_table, incremental_vacuum, enable_incremental_vacuum, analyze
+from core.schema import migrate
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Logging Configuration
 # ---------------------------------------------------------------------------------------------------------------------
 logger = logging.getLogger(__name__)
 
+RESET_PROGRESS_EVERY = 50000
+
 # ---------------------------------------------------------------------------------------------------------------------
 # Admin Class
 # ---------------------------------------------------------------------------------------------------------------------
@@ -22,60 +27,171 @@ class AdminCog(commands.Cog):
         self.bot = bot
 
     @app_commands.command(name="sync_all", description="Owner: Sync all slash commands to all guilds.")
+    @app_commands.describe(force="Sync even where the command tree is unchanged since the last sync")
     @only_owner()
-    async def sync_all(self, interaction: discord.Interaction):
+    async def sync_all(self, interaction: discord.Interaction, force: bool = False):
         if not await owner_check(interaction):
             await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
             return
 
         await interaction.response.defer(ephemeral=True)
-        total_commands = 0
-        total_guilds = len(self.bot.guilds)
+        try:
+            total_guilds = len(self.bot.guilds)
+            status = await interaction.followup.send(f"Syncing commands to {total_guilds} guild(s)...",
+                                                     ephemeral=True, wait=True)
+
+            async def report(done, total, commands):
+                try:
+                    await status.edit(content=f"Syncing commands... {done}/{total} guild(s), {commands} command(s)")
+                except discord.HTTPException:
+                    # A long run outlives the 15-minute interaction token; keep syncing regardless
+                    pass
 
-        for guild in self.bot.guilds:
-            count = await perform_sync(guild=guild)
-            total_commands += count
+            done, total_commands, skipped = await self.bot.sync_engine.sync_many(self.bot.guilds, progress=report,
+                                                                                 force=force)
 
-        await interaction.followup.send(
-            f"Synced commands to {total_guilds} guild(s). Total commands synced: {total_commands}",
-            ephemeral=True
-        )
+            summary = (f"Synced commands to {done} guild(s). Total commands synced: {total_commands}. "
+                       f"Skipped, unchanged: {skipped}")
+            try:
+                await status.edit(content=summary)
+            except discord.HTTPException:
+                logger.info(f"sync_all finished after its interaction expired. {summary}")
+                if interaction.channel is not None:
+                    try:
+                        await interaction.channel.send(f"{interaction.user.mention} {summary}")
+                    except discord.HTTPException:
+                        pass
+        except Exception:
+            logger.exception("Error in sync_all")
+        finally:
+            await log_command_usage(self.bot, interaction)
 
-        await log_command_usage(self.bot, interaction)
     # ---------------------------------------------------------------------------------------------------------------------
+    @app_commands.command(description="Owner: Show event-loop lag, slow callbacks and command latency")
+    @only_owner()
+    async def loop_stats(self, interaction: discord.Interaction):
+        if not await owner_check(interaction):
+            await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+            return
+
+        try:
+            monitor = self.bot.loop_monitor
+            if not monitor.enabled:
+                await interaction.response.send_message(
+                    "`Instrumentation is off. Set INSTRUMENT_LOOP=1 and restart to enable it.`", ephemeral=True)
+                return
+
+            lag = monitor.loop_lag.summary()
+            embed = discord.Embed(title="Event Loop", color=discord.Color.blue())
+            embed.add_field(name="Loop Lag",
+                            value=f"```p50 {lag['p50']}ms | p95 {lag['p95']}ms | p99 {lag['p99']}ms```",
+                            inline=False)
+
+            slow = "\n".join(f"{operation}: {elapsed:.0f}ms" for _, operation, elapsed in
+                             list(monitor.slow_callbacks)[-10:])
+            embed.add_field(name=f"Slow Callbacks (>{monitor.slow_callback_ms}ms, {monitor.slow_total} total)",
+                            value=f"```{slow or 'None'}```", inline=False)
+
+            metrics = self.bot.tree.metrics
+            totals = sorted(metrics.recent().items(), key=lambda item: item[1].count, reverse=True)
+            latency = "\n".join(
+                f"/{name}: n={h.count} p50 {h.percentile(0.5)} p95 {h.percentile(0.95)} p99 {h.percentile(0.99)}"
+                for name, h in totals[:15]
+            )
+            embed.add_field(name=f"Command Latency (ms, last {metrics.window * 2 / 60:.0f} min)",
+                            value=f"```{latency or 'No recent commands'}```", inline=False)
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        except Exception as e:
+            logger.exception("Error in loop_stats")
+            await interaction.response.send_message(f'`Error: Failed to read loop stats. {str(e)}`', ephemeral=True)
+        finally:
+            await log_command_usage(self.bot, interaction)
+
+    # ---------------------------------------------------------------------------------------------------------------------
+    async def _after_table_change(self, table_name):
+        """Drops anything cached from a table that was just reset or deleted."""
+        self.bot.catalogue.invalidate()
+        if table_name == "customisation":
+            self.bot.settings.invalidate()
+        elif table_name == "permissions":
+            self.bot.permissions.invalidate()
+        elif table_name == "blacklist":
+            await self.bot.blacklist.load()
+        elif table_name == "suggestions":
+            await self.bot.suggestions.load()
+        elif table_name == "config":
+            await self.bot.log_channels.build()
+        elif table_name in {"item_stats", "stats_summary"}:
+            await self.bot.stats.resync()
+
     @app_commands.command(description="Owner: Reset a specific table in the database")
+    @app_commands.describe(mode="Chunked delete keeps the bot responsive; drop and recreate is faster on small tables")
+    @app_commands.choices(mode=[
+        app_commands.Choice(name="Chunked delete", value="chunked"),
+        app_commands.Choice(name="Drop and recreate", value="recreate"),
+    ])
     @only_owner()
     @app_commands.autocomplete(table_name=table_name_autocomplete)
-    async def reset_table(self, interaction: discord.Interaction, table_name: str):
+    async def reset_table(self, interaction: discord.Interaction, table_name: str, mode: str = "chunked"):
         if not await owner_check(interaction):
             await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
             return
 
         await interaction.response.defer()
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                cursor = await conn.execute(
-                    "SELECT sql FROM sqlite_master WHERE type='table' AND name = ?",
-                    (table_name,)
-                )
-                schema = await cursor.fetchone()
-                await cursor.close()
-
-                if not schema:
-                    await interaction.followup.send(f'`Error: No table found with name {table_name}`')
-                    return
-
-                await conn.execute(f'DROP TABLE IF EXISTS {table_name}')
-                await conn.execute(schema[0])
-                await conn.commit()
-
-            await interaction.followup.send(f'`Success: {table_name} table has been reset`')
+            table = await self.bot.catalogue.table(table_name)
+            if not table:
+                await interaction.followup.send(f'`Error: No table found with name {table_name}`')
+                return
+
+            # WITHOUT ROWID tables have no rowid to page through
+            if mode == "recreate" or table["without_rowid"]:
+                await recreate_table(self.bot.db, table_name, table)
+            else:
+                status = await interaction.followup.send(f'`Resetting {table_name}...`', wait=True)
+                last_report = 0
+
+                async def report(deleted):
+                    nonlocal last_report
+                    if deleted - last_report >= RESET_PROGRESS_EVERY:
+                        last_report = deleted
+                        await self._edit_status(status, f'`Resetting {table_name}: {deleted} row(s) deleted...`')
+
+                deleted = await clear_table(self.bot.db, table_name, progress=report)
+                await self._edit_status(status, f'`Deleted {deleted} row(s) from {table_name}, reclaiming space...`')
+
+            await self._after_table_change(table_name)
+            freed = await incremental_vacuum(self.bot.db)
+
+            await self._reply(interaction, f'`Success: {table_name} table has been reset ({freed} page(s) freed)`')
         except Exception as e:
             logger.exception("Error in reset_table")
-            await interaction.followup.send(f'`Error: Failed to reset {table_name} table. {str(e)}`')
+            await self._reply(interaction, f'`Error: Failed to reset {table_name} table. {str(e)}`')
         finally:
             await log_command_usage(self.bot, interaction)
 
+    @staticmethod
+    async def _edit_status(status, content):
+        try:
+            await status.edit(content=content)
+        except discord.HTTPException:
+            # A long reset outlives the 15-minute interaction token; the work itself must still finish
+            pass
+
+    @staticmethod
+    async def _reply(interaction, content):
+        """Sends a followup, falling back to the channel once the interaction token has expired."""
+        try:
+            await interaction.followup.send(content)
+        except discord.HTTPException:
+            logger.info(f"/{interaction.command.name} finished after its interaction expired. {content}")
+            if interaction.channel is not None:
+                try:
+                    await interaction.channel.send(f"{interaction.user.mention} {content}")
+                except discord.HTTPException:
+                    pass
+
     # ---------------------------------------------------------------------------------------------------------------------
     @app_commands.command(description="Owner: Delete a specific table from the database")
     @only_owner()
@@ -87,20 +203,12 @@ class AdminCog(commands.Cog):
 
         await interaction.response.defer()
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                cursor = await conn.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name = ?",
-                    (table_name,)
-                )
-                exists = await cursor.fetchone()
-                await cursor.close()
-
-                if not exists:
-                    await interaction.followup.send(f'`Error: No table found with name {table_name}`')
-                    return
+            if not await self.bot.catalogue.table(table_name):
+                await interaction.followup.send(f'`Error: No table found with name {table_name}`')
+                return
 
-                await conn.execute(f'DROP TABLE IF EXISTS {table_name}')
-                await conn.commit()
+            await self.bot.db.execute(f'DROP TABLE IF EXISTS {quote_identifier(table_name)}')
+            await self._after_table_change(table_name)
 
             await interaction.followup.send(f'`Success: {table_name} table has been deleted`')
         except Exception as e:
@@ -109,6 +217,83 @@ class AdminCog(commands.Cog):
         finally:
             await log_command_usage(self.bot, interaction)
 
+    # ---------------------------------------------------------------------------------------------------------------------
+    @app_commands.command(description="Owner: Convert the database once so reset_table can reclaim disk space")
+    @only_owner()
+    async def enable_vacuum(self, interaction: discord.Interaction):
+        if not await owner_check(interaction):
+            await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            if await enable_incremental_vacuum(self.bot.db):
+                await interaction.followup.send('`Success: Database converted to incremental vacuum`', ephemeral=True)
+            else:
+                await interaction.followup.send('`Database already uses incremental vacuum`', ephemeral=True)
+        except Exception as e:
+            logger.exception("Error in enable_vacuum")
+            await interaction.followup.send(f'`Error: Failed to convert database. {str(e)}`', ephemeral=True)
+        finally:
+            await log_command_usage(self.bot, interaction)
+
+    # ---------------------------------------------------------------------------------------------------------------------
+    @app_commands.command(description="Owner: Take a compressed snapshot of the database now")
+    @only_owner()
+    async def backup(self, interaction: discord.Interaction):
+        if not await owner_check(interaction):
+            await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            path = await self.bot.backups.snapshot()
+            await interaction.followup.send(f'`Success: Snapshot saved as {os.path.basename(path)}`', ephemeral=True)
+        except Exception as e:
+            logger.exception("Error in backup")
+            await interaction.followup.send(f'`Error: Failed to take snapshot. {str(e)}`', ephemeral=True)
+        finally:
+            await log_command_usage(self.bot, interaction)
+
+    # ---------------------------------------------------------------------------------------------------------------------
+    @app_commands.command(description="Owner: Restore the database from a snapshot")
+    @only_owner()
+    @app_commands.autocomplete(snapshot=snapshot_autocomplete)
+    async def restore(self, interaction: discord.Interaction, snapshot: str):
+        if not await owner_check(interaction):
+            await interaction.response.send_message("You do not have permission to use this command.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            if snapshot not in self.bot.backups.list_snapshots():
+                await interaction.followup.send(f'`Error: No snapshot found with name {snapshot}`', ephemeral=True)
+                return
+
+            await self.bot.backups.restore(snapshot)
+            # An older snapshot may predate the latest migrations
+            await migrate(self.bot.db)
+            await self._after_restore()
+
+            await interaction.followup.send(f'`Success: Database restored from {snapshot}`', ephemeral=True)
+        except Exception as e:
+            logger.exception("Error in restore")
+            await interaction.followup.send(f'`Error: Failed to restore {snapshot}. {str(e)}`', ephemeral=True)
+        finally:
+            await log_command_usage(self.bot, interaction)
+
+    async def _after_restore(self):
+        """Reloads every cache built from the database, since any table may have changed."""
+        await analyze(self.bot.db)
+        self.bot.catalogue.invalidate()
+        self.bot.permissions.invalidate()
+        self.bot.settings.invalidate()
+        await self.bot.settings.preload()
+        await self.bot.log_channels.build()
+        await self.bot.stats.load()
+        await self.bot.blacklist.load()
+        await self.bot.suggestions.load()
+
     # ---------------------------------------------------------------------------------------------------------------------
     @app_commands.command(description="Owner: Load a Cog")
     @only_owner()
@@ -122,7 +307,8 @@ class AdminCog(commands.Cog):
         try:
             await client.load_extension(f'cogs.{extension}')
             await interaction.followup.send(f'`Success: Loaded {extension}`')
-            await perform_sync()
+            # Guilds whose command tree didn't change are skipped by fingerprint
+            await self.bot.sync_engine.sync_many(self.bot.guilds)
         except Exception as e:
             logger.exception("Error in load")
             await interaction.followup.send(f'`Error: Failed to load {extension}. {str(e)}`')
@@ -162,7 +348,8 @@ class AdminCog(commands.Cog):
             await client.unload_extension(f'cogs.{extension}')
             await client.load_extension(f'cogs.{extension}')
             await interaction.followup.send(f'Reloaded {extension}.')
-            await perform_sync()
+            # Guilds whose command tree didn't change are skipped by fingerprint
+            await self.bot.sync_engine.sync_many(self.bot.guilds)
         except Exception as e:
             logger.exception("Error in reload")
             await interaction.followup.send(f'`Error: Failed to reload {extension}. {str(e)}`')
@@ -1,22 +1,23 @@
 import discord
 import logging
-import aiosqlite
-import psutil
 import inspect
 
 from discord.ext import commands
 from discord import app_commands
 from discord.ui import View, Button
 from datetime import datetime
+from collections import OrderedDict
 
-from core.utils import log_command_usage,  get_embed_colour, owner_check
-from config import DB_PATH
+from core.utils import log_command_usage, get_embed_colour, get_permission_tier
+from core.suggestions import content_hash
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Logging Configuration
 # ---------------------------------------------------------------------------------------------------------------------
 logger = logging.getLogger(__name__)
 
+HELP_CACHE_SIZE = 256
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Help Modals
@@ -32,36 +33,33 @@ class SuggestionModal(discord.ui.Modal):
 
     async def on_submit(self, interaction: discord.Interaction):
         user = interaction.user
-        current_time = discord.utils.utcnow()
-        formatted_time = current_time.strftime("%d/%m/%Y")
-
-        async with aiosqlite.connect(DB_PATH) as conn:
-            cursor = await conn.execute("SELECT 1 FROM blacklist WHERE user_id = ?", (interaction.user.id,))
-            if await cursor.fetchone():
-                support_url = "https://discord.gg/SXmXmteyZ3"  # Your support server link
-                response_message = ("You are blacklisted from making suggestions. "
-                                    f"If you believe this is a mistake, please contact us: [Support Server]({support_url}).")
-                await interaction.response.send_message(response_message, ephemeral=True)
-                return
-            colour = await get_embed_colour(interaction.guild.id)
-
-        channel = self.bot.get_channel(1268168019297697914)
-        if channel:
-            embed = discord.Embed(title=f"Suggestion: {self.ticket_name.value}",
-                                  description=f"```{self.suggestion.value}```",
-                                  color=colour)
-            embed.add_field(name="Additional Information",
-                            value=f"```{self.additional_info.value or 'None provided'}```",
-                            inline=False)
-            embed.set_footer(text=f"Submitted by {user.name} on {formatted_time}")
 
-            view = View()
-            view.add_item(BlacklistButton(interaction.user.id))
+        if await self.bot.blacklist.contains(interaction.user.id):
+            support_url = "https://discord.gg/SXmXmteyZ3"  # Your support server link
+            response_message = ("You are blacklisted from making suggestions. "
+                                f"If you believe this is a mistake, please contact us: [Support Server]({support_url}).")
+            await interaction.response.send_message(response_message, ephemeral=True)
+            return
 
-            await channel.send(embed=embed, view=view)
-            await interaction.response.send_message("Your suggestion has been submitted successfully!", ephemeral=True)
-        else:
+        suggestions = self.bot.suggestions
+        if not suggestions.channel():
             await interaction.response.send_message("Failed to send suggestion. Support channel not found.", ephemeral=True)
+            return
+
+        refused = suggestions.submit({
+            "user_id": user.id,
+            "user_name": user.name,
+            "guild_id": interaction.guild_id,
+            "title": self.ticket_name.value,
+            "suggestion": self.suggestion.value,
+            "additional_info": self.additional_info.value or None,
+            "content_hash": content_hash(self.ticket_name.value, self.suggestion.value),
+            "created": discord.utils.utcnow(),
+        })
+        if refused:
+            await interaction.response.send_message(refused, ephemeral=True)
+        else:
+            await interaction.response.send_message("Your suggestion has been submitted successfully!", ephemeral=True)
 
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -73,63 +71,58 @@ class BlacklistButton(discord.ui.Button):
         self.user_id = user_id
 
     async def callback(self, interaction: discord.Interaction):
-        async with aiosqlite.connect(DB_PATH) as conn:
-            await conn.execute("INSERT OR IGNORE INTO blacklist (user_id) VALUES (?)", (self.user_id,))
-            await conn.commit()
+        await interaction.client.blacklist.add(self.user_id)
         await interaction.response.send_message("User has been blacklisted from making suggestions.", ephemeral=True)
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Help View
 # ---------------------------------------------------------------------------------------------------------------------
-class HelpPaginator(View):
-    def __init__(self, bot, pages, updates_page):
-        super().__init__(timeout=180)
-        self.bot = bot
-        self.pages = pages
-        self.current_page = 0
-        self.updates_page = updates_page
-
-        self.prev_button = Button(label="Prev", style=discord.ButtonStyle.primary)
-        self.prev_button.callback = self.prev_page
-        self.add_item(self.prev_button)
-
-        self.home_button = Button(label="Home", style=discord.ButtonStyle.green)
-        self.home_button.callback = self.go_home
-        self.add_item(self.home_button)
-
-        self.next_button = Button(label="Next", style=discord.ButtonStyle.primary)
-        self.next_button.callback = self.next_page
-        self.add_item(self.next_button)
-
-        self.updates_button = Button(label="Updates", style=discord.ButtonStyle.secondary)
-        self.updates_button.callback = self.go_to_updates
-        self.add_item(self.updates_button)
-
-    async def next_page(self, interaction: discord.Interaction):
-        self.current_page += 1
-        if self.current_page >= len(self.pages):
-            self.current_page = 0
-        await interaction.response.edit_message(embed=self.pages[self.current_page], view=self)
-
-    async def prev_page(self, interaction: discord.Interaction):
-        self.current_page -= 1
-        if self.current_page < 0:
-            self.current_page = len(self.pages) - 1
-        await interaction.response.edit_message(embed=self.pages[self.current_page], view=self)
-
-    async def go_home(self, interaction: discord.Interaction):
-        self.current_page = 0
-        await interaction.response.edit_message(embed=self.pages[self.current_page], view=self)
-
-    async def go_to_updates(self, interaction: discord.Interaction):
-        await interaction.response.edit_message(embed=self.updates_page, view=self)
-
-    async def start(self, interaction: discord.Interaction):
-        for page in self.pages:
-            page.set_thumbnail(url=self.bot.user.display_avatar.url)
-            page.set_footer(text="Created by heyimneph")
-            page.timestamp = discord.utils.utcnow()
-        await interaction.response.send_message(embed=self.pages[self.current_page], view=self, ephemeral=True)
+HELP_BUTTONS = {
+    "prev": ("Prev", discord.ButtonStyle.primary),
+    "home": ("Home", discord.ButtonStyle.green),
+    "next": ("Next", discord.ButtonStyle.primary),
+    "updates": ("Updates", discord.ButtonStyle.secondary),
+}
+
+
+class HelpButton(discord.ui.DynamicItem[Button],
+                 template=r"help:(?P<action>prev|home|next|updates):(?P<page>\d+):(?P<tier>[a-z]+):(?P<guild>\d+)"):
+    """A help navigation button whose state lives entirely in its custom_id, so it works across restarts."""
+
+    def __init__(self, action, page, tier, guild_id):
+        label, style = HELP_BUTTONS[action]
+        super().__init__(Button(label=label, style=style, custom_id=f"help:{action}:{page}:{tier}:{guild_id}"))
+        self.action = action
+        self.page = page
+        self.tier = tier
+        self.guild_id = guild_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(match["action"], int(match["page"]), match["tier"], int(match["guild"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("UtilityCog")
+        if cog is None:
+            await interaction.response.send_message("Help is unavailable right now.", ephemeral=True)
+            return
+        await cog.show_help_page(interaction, self.action, self.page, self.tier, self.guild_id)
+
+
+def help_view(page, tier, guild_id):
+    view = View(timeout=None)
+    for action in HELP_BUTTONS:
+        view.add_item(HelpButton(action, page, tier, guild_id))
+    # Clicks are routed to HelpButton by custom_id, so the view itself never needs to be kept alive
+    view.stop()
+    return view
+
+
+def stamped(page):
+    # Pages are shared through the help cache, so stamp a copy rather than the cached embed
+    embed = page.copy()
+    embed.timestamp = discord.utils.utcnow()
+    return embed
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Utility Cog Class
@@ -139,17 +132,43 @@ class UtilityCog(commands.Cog):
         self.bot = bot
         self.bot_start_time = datetime.utcnow()
 
-    async def has_required_permissions(self, interaction, command):
+        self._help_pages = OrderedDict()
+        self._help_version = None
+
+    async def cog_load(self):
+        self.bot.add_dynamic_items(HelpButton)
+        self.bot.suggestions.render = self.render_suggestion
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(HelpButton)
+        self.bot.suggestions.render = None
+
+    async def render_suggestion(self, record):
+        """Builds the support-channel message for a queued suggestion, new or reloaded after a restart."""
+        user = self.bot.get_user(record["user_id"])
+        user_name = record.get("user_name") or (user.name if user else str(record["user_id"]))
+        colour = await get_embed_colour(record["guild_id"]) if record["guild_id"] else discord.Color.blue()
+
+        embed = discord.Embed(title=f"Suggestion: {record['title']}",
+                              description=f"```{record['suggestion']}```",
+                              color=colour)
+        embed.add_field(name="Additional Information",
+                        value=f"```{record['additional_info'] or 'None provided'}```",
+                        inline=False)
+        embed.set_footer(text=f"Submitted by {user_name} on {record['created'].strftime('%d/%m/%Y')}")
+
+        view = View()
+        view.add_item(BlacklistButton(record["user_id"]))
+        return {"embed": embed, "view": view}
+
+    async def has_required_permissions(self, interaction, command, authorised=None):
         if interaction.user.guild_permissions.administrator:
             return True
 
-        async with aiosqlite.connect(DB_PATH) as conn:
-            cursor = await conn.execute('''
-                SELECT can_use_commands FROM permissions WHERE guild_id = ? AND user_id = ?
-            ''', (interaction.guild.id, interaction.user.id))
-            permission = await cursor.fetchone()
-            if permission and permission[0]:
-                return True
+        if authorised is None:
+            authorised = await self.bot.permissions.can_use_commands(interaction.guild.id, interaction.user.id)
+        if authorised:
+            return True
 
         if "Admin" in command.description or "Owner" in command.description:
             return False
@@ -169,68 +188,124 @@ class UtilityCog(commands.Cog):
         return True
 
 
+    # ---------------------------------------------------------------------------------------------------------------------
+    def _cog_version(self):
+        # Loading, unloading or reloading a cog replaces the cog object, which changes this value
+        return tuple((name, id(cog)) for name, cog in self.bot.cogs.items())
+
+    async def _build_help_pages(self, interaction, colour, tier):
+        pages = []
+        is_owner = tier == "owner"
+        elevated = tier in {"owner", "admin", "authorised"}
+
+        # Main help intro page
+        help_intro = discord.Embed(
+            title="About BOT",
+            description=(
+                "Welcome to **BOT** – WRITE DESCRIPTION HERE!\n\n"
+
+            ),
+            color=colour
+        )
+
+        help_intro.add_field(name="",value="",inline=False)
+        help_intro.add_field(
+            name="Getting Started",
+            value=("WRITE YOUR BOT INSTURCTIONS HERE")
+        )
+        help_intro.add_field(name="Need Support?",
+                             value="*Sometimes, things don't work as expected. If you need assistance or "
+                                   "would like to report an issue you can join our "
+                                   "[support server](https://discord.gg/SXmXmteyZ3) and create a ticket. We'd be "
+                                   "happy to help!*",
+                             inline=False)
+
+        pages.append(help_intro)
+
+        # Generating command pages
+        for cog_name, cog in self.bot.cogs.items():
+            if cog_name in {"Core", "BotCore", "AdminCog"}:
+                continue
+            embed = discord.Embed(title=f"{cog_name.replace('Cog', '')} Commands", description="", color=colour)
+
+            for cmd in cog.get_app_commands():
+                if "Owner" in cmd.description and not is_owner:
+                    continue
+                if not await self.has_required_permissions(interaction, cmd, elevated):
+                    continue
+                embed.add_field(name=f"/{cmd.name}", value=f"```{cmd.description}```", inline=False)
+
+            if embed.fields:
+                pages.append(embed)
+
+        for page in pages:
+            page.set_thumbnail(url=self.bot.user.display_avatar.url)
+            page.set_footer(text="Created by heyimneph")
+
+        # Updates page
+        updates_page = discord.Embed(
+            title="Latest Updates",
+            description=(
+                "11/07/2025\n"
+                "- BOT is live \n\n"
+               # "Please leave a review/rating here: https://top.gg/bot/1268589797149118670"
+            ),
+            color=colour
+        )
+        updates_page.set_footer(text="Created by heyimneph")
+
+        return pages, updates_page
+
+    async def get_help_pages(self, interaction, tier=None):
+        """Returns (pages, updates_page) for the caller, built once per colour, tier and loaded cog set."""
+        colour = await get_embed_colour(interaction.guild.id)
+        tier = tier or await get_permission_tier(interaction)
+        key = (colour, tier, self.bot.user.display_avatar.url)
+
+        version = self._cog_version()
+        if version != self._help_version:
+            self._help_pages.clear()
+            self._help_version = version
+
+        cached = self._help_pages.get(key)
+        if cached is None:
+            cached = await self._build_help_pages(interaction, colour, tier)
+            self._help_pages[key] = cached
+            while len(self._help_pages) > HELP_CACHE_SIZE:
+                self._help_pages.popitem(last=False)
+        else:
+            self._help_pages.move_to_end(key)
+
+        return cached
+
+    async def show_help_page(self, interaction, action, page, tier, guild_id):
+        """Handles a help button click, re-rendering from the help cache."""
+        current_tier = await get_permission_tier(interaction)
+        # The caller's tier or guild changed since the message was sent, so its page numbers may not line up
+        if current_tier != tier or guild_id != interaction.guild_id:
+            action, page = "home", 0
+
+        pages, updates_page = await self.get_help_pages(interaction, tier=current_tier)
+        page = min(page, len(pages) - 1)
+        if action == "next":
+            page = (page + 1) % len(pages)
+        elif action == "prev":
+            page = (page - 1) % len(pages)
+        elif action == "home":
+            page = 0
+
+        embed = stamped(updates_page if action == "updates" else pages[page])
+        await interaction.response.edit_message(embed=embed, view=help_view(page, current_tier, interaction.guild_id))
+
     # ---------------------------------------------------------------------------------------------------------------------
     @app_commands.command(name="help", description="User: Display help information for all commands.")
     async def help(self, interaction: discord.Interaction):
         try:
-            pages = []
-            colour = await get_embed_colour(interaction.guild.id)
-
-            # Main help intro page
-            help_intro = discord.Embed(
-                title="About BOT",
-                description=(
-                    "Welcome to **BOT** – WRITE DESCRIPTION HERE!\n\n"
-
-                ),
-                color=colour
-            )
-
-            help_intro.add_field(name="",value="",inline=False)
-            help_intro.add_field(
-                name="Getting Started",
-                value=("WRITE YOUR BOT INSTURCTIONS HERE")
-            )
-            help_intro.add_field(name="Need Support?",
-                                 value="*Sometimes, things don't work as expected. If you need assistance or "
-                                       "would like to report an issue you can join our "
-                                       "[support server](https://discord.gg/SXmXmteyZ3) and create a ticket. We'd be "
-                                       "happy to help!*",
-                                 inline=False)
-
-            pages.append(help_intro)
-
-            # Generating command pages
-            for cog_name, cog in self.bot.cogs.items():
-                if cog_name in {"Core", "BotCore", "AdminCog"}:
-                    continue
-                embed = discord.Embed(title=f"{cog_name.replace('Cog', '')} Commands", description="", color=colour)
-
-                for cmd in cog.get_app_commands():
-                    if "Owner" in cmd.description and not await owner_check(interaction):
-                        continue
-                    if not await self.has_required_permissions(interaction, cmd):
-                        continue
-                    embed.add_field(name=f"/{cmd.name}", value=f"```{cmd.description}```", inline=False)
-
-                if embed.fields:
-                    pages.append(embed)
-
-            # Updates page
-            updates_page = discord.Embed(
-                title="Latest Updates",
-                description=(
-                    "11/07/2025\n"
-                    "- BOT is live \n\n"
-                   # "Please leave a review/rating here: https://top.gg/bot/1268589797149118670"
-                ),
-                color=colour
-            )
-            updates_page.set_footer(text="Created by heyimneph")
-            updates_page.timestamp = discord.utils.utcnow()
-
-            paginator = HelpPaginator(self.bot, pages=pages, updates_page=updates_page)
-            await paginator.start(interaction)
+            tier = await get_permission_tier(interaction)
+            pages, _ = await self.get_help_pages(interaction, tier=tier)
+
+            await interaction.response.send_message(embed=stamped(pages[0]),
+                                                    view=help_view(0, tier, interaction.guild.id), ephemeral=True)
 
         except Exception as e:
             logger.error(f"Error with Help command: {e}")
@@ -259,15 +334,12 @@ class UtilityCog(commands.Cog):
         colour = await get_embed_colour(interaction.guild.id)
 
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                cursor = await conn.execute("SELECT SUM(items_collected) FROM item_stats")
-                total_collected = (await cursor.fetchone())[0] or 0
+            stats = self.bot.stats
+            total_collected = stats.items_collected
+            total_destroyed = stats.items_destroyed
 
-                cursor = await conn.execute("SELECT SUM(items_destroyed) FROM item_stats")
-                total_destroyed = (await cursor.fetchone())[0] or 0
-
-            total_servers = len(self.bot.guilds)
-            total_users = sum(len(guild.members) for guild in self.bot.guilds)
+            total_servers = stats.guild_count
+            total_users = stats.member_count
 
             bot_ping = round(self.bot.latency * 1000)
             bot_uptime = datetime.utcnow() - self.bot_start_time
@@ -290,8 +362,13 @@ class UtilityCog(commands.Cog):
             else:
                 uptime_display = "0 minute(s)"
 
-            cpu = psutil.cpu_percent()
-            memory = psutil.virtual_memory().percent
+            sample = self.bot.sampler.latest()
+            if sample:
+                cpu_window = self.bot.sampler.summary("cpu")
+                cpu = f"{sample['cpu']:.1f}% (avg {cpu_window[1]:.1f}%)"
+                memory = f"{sample['memory']:.1f}% ({sample['rss_mb']:.0f} MB)"
+            else:
+                cpu = memory = "n/a"
 
             embed = discord.Embed(title="", description="",
                                   color=colour)
@@ -302,8 +379,8 @@ class UtilityCog(commands.Cog):
             embed.add_field(name="🏡 Servers", value=f"┕ `{total_servers}`", inline=True)
             embed.add_field(name="🏓 Ping", value=f"┕ `{bot_ping} ms`", inline=True)
             embed.add_field(name="🌐 Language", value=f"┕ `Python`", inline=True)
-            embed.add_field(name="‍💻 CPU", value=f"┕ `{cpu}%`", inline=True)
-            embed.add_field(name="💾 Memory", value=f"┕ `{memory}%`", inline=True)
+            embed.add_field(name="‍💻 CPU", value=f"┕ `{cpu}`", inline=True)
+            embed.add_field(name="💾 Memory", value=f"┕ `{memory}`", inline=True)
             embed.add_field(name="⏳ Uptime", value=f"┕ `{uptime_display}`", inline=True)
 
             await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -320,12 +397,11 @@ class UtilityCog(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def authorise(self, interaction: discord.Interaction, user: discord.User):
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                await conn.execute('''
-                    INSERT INTO permissions (guild_id, user_id, can_use_commands) VALUES (?, ?, 1)
-                    ON CONFLICT(guild_id, user_id) DO UPDATE SET can_use_commands = 1
-                ''', (interaction.guild.id, user.id))
-                await conn.commit()
+            await self.bot.db.write('''
+                INSERT INTO permissions (guild_id, user_id, can_use_commands) VALUES (?, ?, 1)
+                ON CONFLICT(guild_id, user_id) DO UPDATE SET can_use_commands = 1
+            ''', (interaction.guild.id, user.id))
+            self.bot.permissions.set(interaction.guild.id, user.id, True)
             await interaction.response.send_message(f"{user.display_name} has been authorized.", ephemeral=True)
 
         except Exception as e:
@@ -342,11 +418,10 @@ class UtilityCog(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def unauthorise(self, interaction: discord.Interaction, user: discord.User):
         try:
-            async with aiosqlite.connect(DB_PATH) as conn:
-                await conn.execute('''
-                    UPDATE permissions SET can_use_commands = 0 WHERE guild_id = ? AND user_id = ?
-                ''', (interaction.guild.id, user.id))
-                await conn.commit()
+            await self.bot.db.write('''
+                UPDATE permissions SET can_use_commands = 0 WHERE guild_id = ? AND user_id = ?
+            ''', (interaction.guild.id, user.id))
+            self.bot.permissions.set(interaction.guild.id, user.id, False)
             await interaction.response.send_message(f"{user.display_name} has been unauthorized.", ephemeral=True)
         except Exception as e:
             logger.error(f"Failed to unauthorise user: {e}")
@@ -360,22 +435,6 @@ class UtilityCog(commands.Cog):
 # Setup Function
 # ---------------------------------------------------------------------------------------------------------------------
 async def setup(bot):
-    async with aiosqlite.connect(DB_PATH) as conn:
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS blacklist (
-                user_id INTEGER PRIMARY KEY
-            )
-        ''')
-        await conn.execute('''
-                CREATE TABLE IF NOT EXISTS permissions (
-                    guild_id INTEGER,
-                    user_id INTEGER,
-                    can_use_commands BOOLEAN DEFAULT 0,
-                    PRIMARY KEY (guild_id, user_id)
-                )
-            ''')
-
-        await conn.commit()
     await bot.add_cog(UtilityCog(bot))
 
 
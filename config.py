@@ -1,19 +1,55 @@
 import os
+import json
 import discord
+import hashlib
 import logging
 
 from datetime import datetime
+from contextlib import nullcontext
 from discord.ext import commands
 from dotenv import load_dotenv
 from discord.ext.commands import Context, is_owner
 
+from core.database import Database
+from core.schema import PRAGMAS
+from core.settings import GuildSettingsCache
+from core.permissions import PermissionResolver
+from core.audit import AuditQueue
+from core.logchannels import LogChannelIndex
+from core.sync import SyncEngine
+from core.stats import StatsAggregator
+from core.catalogue import SchemaCatalogue
+from core.metrics import SystemSampler
+from core.instrumentation import LoopMonitor
+from core.middleware import InstrumentedCommandTree, MetricsExporter
+from core.backup import BackupManager
+from core.logs import setup_logging
+from core.fetch import HttpFetcher
+from core.blacklist import Blacklist
+from core.ratelimit import CommandRateLimiter
+from core.suggestions import SuggestionQueue
+
 # Load environment variables
 load_dotenv(".env")
 
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 OWNER_ID = int(os.getenv("OWNER_ID", 0))
 TEST_GUILD_ID = int(os.getenv("TEST_GUILD_ID", 0)) or None
-
+SYNC_CONCURRENCY = int(os.getenv("SYNC_CONCURRENCY", 5))
+INSTRUMENT_LOOP = os.getenv("INSTRUMENT_LOOP", "0").lower() in ("1", "true", "yes")
+SLOW_CALLBACK_MS = int(os.getenv("SLOW_CALLBACK_MS", 100))
+METRICS_FILE = os.getenv("METRICS_FILE") or None
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0)) or None
+BACKUP_INTERVAL_HOURS = float(os.getenv("BACKUP_INTERVAL_HOURS", 6))
+BACKUP_KEEP = int(os.getenv("BACKUP_KEEP", 7))
+SUGGESTION_CHANNEL_ID = int(os.getenv("SUGGESTION_CHANNEL_ID", 1268168019297697914))
+
+# Per-command overrides of the default (uses, seconds) limits; None disables that bucket
+COMMAND_RATE_LIMITS = {
+    "help": {"user": (3, 10.0)},
+    "stats": {"user": (3, 30.0)},
+    "suggest": {"user": (2, 300.0), "guild": (10, 300.0)},
+}
 
 DISCORD_PREFIX = "!"
 LAUNCH_TIME = datetime.utcnow()
@@ -24,6 +60,7 @@ LAUNCH_TIME = datetime.utcnow()
 # ---------------------------------------------------------------------------------------------------------------------
 DB_DIR = os.path.join('data', 'databases')
 DB_PATH = os.path.join(DB_DIR, 'template.db')
+BACKUP_DIR = os.path.join('data', 'backups')
 os.makedirs(DB_DIR, exist_ok=True)
 
 # ---------------------------------------------------------------------------------------------------------------------
@@ -32,13 +69,22 @@ os.makedirs(DB_DIR, exist_ok=True)
 os.makedirs("data/logs", exist_ok=True)
 os.makedirs("data/databases", exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[
-        logging.FileHandler("data/logs/discord.log", encoding="utf-8", mode="w"),
-        logging.StreamHandler()
-    ]
+# High-frequency call sites, capped per call site as (records, seconds)
+LOG_RATE_LIMITS = {
+    "core.instrumentation": (5, 60.0),
+    "core.audit": (5, 60.0),
+    "core.metrics": (1, 300.0),
+    "discord.gateway": (10, 60.0),
+}
+
+LOG_LISTENER = setup_logging(
+    "data/logs/discord.log",
+    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+    json_lines=os.getenv("LOG_JSON", "0").lower() in ("1", "true", "yes"),
+    max_bytes=int(os.getenv("LOG_MAX_MB", 10)) * 1024 * 1024,
+    backup_count=int(os.getenv("LOG_BACKUPS", 5)),
+    rotate_hours=float(os.getenv("LOG_ROTATE_HOURS", 24)),
+    rate_limits=LOG_RATE_LIMITS,
 )
 
 logger = logging.getLogger(__name__)
@@ -54,25 +100,76 @@ client = commands.Bot(
     command_prefix=DISCORD_PREFIX,
     intents=intents,
     help_command=None,
+    tree_cls=InstrumentedCommandTree,
     activity=discord.Activity(type=discord.ActivityType.playing, name="games -- /help")
 )
 
+# Opened in bot.main() before any extension is loaded
+client.db = Database(DB_PATH, init_pragmas=PRAGMAS)
+client.settings = GuildSettingsCache(client.db)
+client.permissions = PermissionResolver(client.db)
+client.blacklist = Blacklist(client.db)
+client.audit = AuditQueue(client)
+client.suggestions = SuggestionQueue(client, SUGGESTION_CHANNEL_ID)
+client.log_channels = LogChannelIndex(client)
+client.stats = StatsAggregator(client)
+client.catalogue = SchemaCatalogue(client.db)
+client.sampler = SystemSampler()
+client.loop_monitor = LoopMonitor(slow_callback_ms=SLOW_CALLBACK_MS)
+client.tree.limiter = CommandRateLimiter(overrides=COMMAND_RATE_LIMITS, exempt_users={OWNER_ID})
+client.metrics_exporter = MetricsExporter(client.tree.metrics, path=METRICS_FILE, port=METRICS_PORT)
+client.fetcher = HttpFetcher()
+client.backups = BackupManager(client.db, BACKUP_DIR, interval_hours=BACKUP_INTERVAL_HOURS, keep=BACKUP_KEEP)
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Sync Function
 # ---------------------------------------------------------------------------------------------------------------------
-async def perform_sync(guild: discord.abc.Snowflake):
+def tree_fingerprint(guild):
+    """Hashes the payload tree.sync() would upload for this guild."""
+    payload = [command.to_dict(client.tree) for command in client.tree.get_commands(guild=guild)]
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+async def perform_sync(guild: discord.abc.Snowflake, force: bool = False, gate=None):
+    """Copies the global commands to a guild and syncs that guild. Nothing is ever uploaded globally.
+
+    Returns (command_count, skipped). The sync is skipped when the tree's fingerprint matches the one
+    stored for that guild at the last successful sync, unless force is set. gate, if given, is an async
+    context manager factory entered only around the upload itself, e.g. the sync engine's rate pacing.
+    """
+    scope = str(guild.id)
+    target = f"guild: {getattr(guild, 'name', 'Unknown')} ({guild.id})"
     try:
         client.tree.clear_commands(guild=guild)
         client.tree.copy_global_to(guild=guild)
-        synced = await client.tree.sync(guild=guild)
 
-        logger.info(f"Synced {len(synced)} command(s) to guild: {getattr(guild, 'name', 'Unknown')} ({guild.id})")
-        return len(synced)
+        fingerprint = tree_fingerprint(guild)
+        count = len(client.tree.get_commands(guild=guild))
+
+        if not force:
+            row = await client.db.fetchone('SELECT fingerprint FROM sync_state WHERE scope = ?', (scope,))
+            if row and row[0] == fingerprint:
+                logger.debug(f"Skipped sync to {target}: skipped, unchanged")
+                return count, True
+
+        async with gate() if gate else nullcontext():
+            synced = await client.tree.sync(guild=guild)
+        await client.db.execute('''
+            INSERT INTO sync_state (scope, fingerprint, synced_at) VALUES (?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(scope) DO UPDATE SET fingerprint = excluded.fingerprint, synced_at = excluded.synced_at
+        ''', (scope, fingerprint))
+
+        logger.debug(f"Synced {len(synced)} command(s) to {target}")
+        return len(synced), False
 
     except Exception as e:
         logger.exception(f"Failed to sync commands: {e}")
-        return 0
+        return 0, False
+
+
+client.sync_engine = SyncEngine(perform_sync, concurrency=SYNC_CONCURRENCY)
 
 
 
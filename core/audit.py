@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import discord
+
+from collections import defaultdict
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_CHARS_PER_MESSAGE = 6000
+MAX_FIELD_VALUE = 1024
+
+
+def _truncate(text, limit):
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Audit Record
+# ---------------------------------------------------------------------------------------------------------------------
+def build_record(interaction):
+    """Captures the few fields the audit embed needs, so the interaction itself is not kept alive."""
+    command_options = ""
+    if 'options' in interaction.data:
+        for option in interaction.data['options']:
+            command_options += f"{option['name']}: {option.get('value', 'Not provided')}\n"
+
+    user = interaction.user
+    channel = interaction.channel
+
+    return {
+        "command": interaction.command.name,
+        "guild_id": interaction.guild_id,
+        "user_id": user.id if user else None,
+        "user_name": str(user) if user else "Unknown",
+        "user_mention": user.mention if user else "Unknown",
+        "avatar_url": user.display_avatar.url if user else None,
+        "channel_mention": channel.mention if channel and hasattr(channel, "mention") else "DM",
+        "options": command_options.strip(),
+        "timestamp": discord.utils.utcnow(),
+    }
+
+
+def build_embed(record):
+    embed = discord.Embed(
+        description=f"Command: `{record['command']}`",
+        color=discord.Color.blue()
+    )
+    embed.add_field(name="User", value=record["user_mention"], inline=True)
+    embed.add_field(name="Guild ID", value=record["guild_id"] or "DM", inline=True)
+    embed.add_field(name="Channel", value=record["channel_mention"], inline=True)
+    if record["options"]:
+        embed.add_field(name="Command Options", value=_truncate(record["options"], MAX_FIELD_VALUE), inline=False)
+
+    embed.set_footer(text=f"User ID: {record['user_id'] or 'Unknown'}")
+    embed.set_author(name=record["user_name"], icon_url=record["avatar_url"])
+    embed.timestamp = record["timestamp"]
+    return embed
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Audit Queue
+# ---------------------------------------------------------------------------------------------------------------------
+class AuditQueue:
+    """Bounded queue of command-audit records, delivered per guild in batches by a background worker.
+
+    When the queue is full the oldest pending record is dropped, so commands never wait on audit delivery.
+    """
+
+    def __init__(self, bot, max_pending=1000, batch_interval=2.0):
+        self.bot = bot
+        self.batch_interval = batch_interval
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._worker = None
+        self._batch = []
+        self._delivery = None
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.sent = 0
+
+    def enqueue(self, record):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                logger.warning(f"Audit queue full, dropped {self.dropped} record(s) so far")
+        self._queue.put_nowait(record)
+        self.enqueued += 1
+
+    def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run(), name="audit-worker")
+
+    async def stop(self, timeout=10.0):
+        """Stops the worker, lets an in-flight delivery finish, and delivers whatever is still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._delivery is not None and not self._delivery.done():
+            try:
+                await asyncio.wait_for(self._delivery, timeout)
+            except Exception as e:
+                logger.warning(f"In-flight audit delivery did not finish on shutdown: {e}")
+        self._delivery = None
+
+        pending = self._batch + self._drain()
+        self._batch = []
+        if pending:
+            logger.info(f"Flushing {len(pending)} audit record(s) on shutdown")
+            await self._deliver(pending)
+
+    # -----------------------------------------------------------------------------------------------------------------
+    def _drain(self):
+        records = []
+        while not self._queue.empty():
+            records.append(self._queue.get_nowait())
+        return records
+
+    async def _run(self):
+        while True:
+            # Records stay in self._batch while the worker waits, so stop() can still flush them
+            self._batch = [await self._queue.get()]
+            await asyncio.sleep(self.batch_interval)
+            batch, self._batch = self._batch + self._drain(), []
+            # Shielded so cancelling the worker in stop() doesn't drop a batch halfway through sending
+            self._delivery = asyncio.ensure_future(self._deliver(batch))
+            try:
+                await asyncio.shield(self._delivery)
+            except Exception as e:
+                logger.exception(f"Audit delivery failed: {e}")
+
+    @staticmethod
+    def _pack(embeds):
+        """Groups embeds into messages within Discord's 10-embed and 6000-character limits."""
+        message, size = [], 0
+        for embed in embeds:
+            length = len(embed)
+            if message and (len(message) == MAX_EMBEDS_PER_MESSAGE or size + length > MAX_CHARS_PER_MESSAGE):
+                yield message
+                message, size = [], 0
+            message.append(embed)
+            size += length
+        if message:
+            yield message
+
+    async def _deliver(self, records):
+        by_guild = defaultdict(list)
+        for record in records:
+            by_guild[record["guild_id"]].append(record)
+
+        for guild_id, guild_records in by_guild.items():
+            log_channel = self.bot.log_channels.resolve(guild_id)
+            if not log_channel:
+                logger.debug(f"No log channel found for {len(guild_records)} command(s) in guild {guild_id or 'DM'}")
+                continue
+
+            for embeds in self._pack([build_embed(record) for record in guild_records]):
+                try:
+                    await log_channel.send(embeds=embeds)
+                    self.sent += len(embeds)
+                except discord.HTTPException as e:
+                    logger.error(f"Failed to send audit log to guild {guild_id}: {e}")
@@ -1,32 +1,76 @@
 import os
-import aiosqlite
+import time
 import logging
 
 from discord import app_commands, Interaction
-from config import DB_PATH
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Logging Configuration
 # ---------------------------------------------------------------------------------------------------------------------
 logger = logging.getLogger(__name__)
 
+# Discord shows at most 25 autocomplete choices
+MAX_CHOICES = 25
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Cog Index
+# ---------------------------------------------------------------------------------------------------------------------
+class CogIndex:
+    """Cog names from the cogs folder, re-read only when the directory's mtime changes.
+
+    The mtime itself is checked at most once every recheck seconds, so keystrokes never touch the disk.
+    """
+
+    def __init__(self, cogs_dir="cogs", recheck=5.0):
+        self.cogs_dir = cogs_dir
+        self.recheck = recheck
+        self._names = []
+        self._mtime = None
+        self._checked_at = 0.0
+
+    def names(self):
+        now = time.monotonic()
+        if now - self._checked_at >= self.recheck:
+            self._checked_at = now
+            mtime = os.stat(self.cogs_dir).st_mtime_ns
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self._names = sorted(
+                    filename[:-3] for filename in os.listdir(self.cogs_dir) if filename.endswith(".py")
+                )
+                logger.debug(f"[Autocomplete] Indexed {len(self._names)} cog(s)")
+        return self._names
+
+
+cog_index = CogIndex()
+
 
 # ---------------------------------------------------------------------------------------------------------------------
 # Autocomplete Functions
 # ---------------------------------------------------------------------------------------------------------------------
 async def cog_autocomplete(interaction: Interaction, current: str):
-    """Suggests Python cog files from the cogs folder."""
+    """Suggests cogs from the cogs folder, prefix matches first, labelled loaded or unloaded."""
     try:
-        suggestions = []
-        cogs_dir = "cogs"
+        current = current.lower()
+        prefix, substring = [], []
+        for cog_name in cog_index.names():
+            lowered = cog_name.lower()
+            if lowered.startswith(current):
+                prefix.append(cog_name)
+            elif current in lowered:
+                substring.append(cog_name)
 
-        for filename in os.listdir(cogs_dir):
-            if filename.endswith(".py"):
-                cog_name = filename[:-3]
-                if current.lower() in cog_name.lower():
-                    suggestions.append(app_commands.Choice(name=cog_name, value=cog_name))
+        loaded = interaction.client.extensions
+        suggestions = [
+            app_commands.Choice(
+                name=f"{cog_name} ({'loaded' if f'cogs.{cog_name}' in loaded else 'unloaded'})",
+                value=cog_name
+            )
+            for cog_name in (prefix + substring)[:MAX_CHOICES]
+        ]
 
-        logger.info(f"[Autocomplete] cog_autocomplete: matched {len(suggestions)} result(s) for '{current}'")
+        logger.debug(f"[Autocomplete] cog_autocomplete: matched {len(suggestions)} result(s) for '{current}'")
         return suggestions
 
     except Exception as e:
@@ -35,20 +79,36 @@ async def cog_autocomplete(interaction: Interaction, current: str):
 
 
 async def table_name_autocomplete(interaction: Interaction, current: str):
-    """Suggests table names from the SQLite database."""
+    """Suggests table names from the schema catalogue, with approximate row counts."""
     try:
-        async with aiosqlite.connect(DB_PATH()) as conn:
-            cursor = await conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in await cursor.fetchall()]
-
+        tables = await interaction.client.catalogue.ensure()
         filtered = [
-            app_commands.Choice(name=table, value=table)
-            for table in tables if current.lower() in table.lower()
-        ]
+            app_commands.Choice(
+                name=f"{table} (~{info['rows']} rows)" if info["rows"] is not None else table,
+                value=table
+            )
+            for table, info in sorted(tables.items()) if current.lower() in table.lower()
+        ][:MAX_CHOICES]
 
-        logger.info(f"[Autocomplete] table_name_autocomplete: {len(filtered)} matches for '{current}'")
+        logger.debug(f"[Autocomplete] table_name_autocomplete: {len(filtered)} matches for '{current}'")
         return filtered
 
     except Exception as e:
         logger.exception(f"[Autocomplete] Failed table_name_autocomplete for input '{current}': {e}")
         return []
+
+
+async def snapshot_autocomplete(interaction: Interaction, current: str):
+    """Suggests database snapshots, newest first."""
+    try:
+        filtered = [
+            app_commands.Choice(name=name, value=name)
+            for name in interaction.client.backups.list_snapshots() if current.lower() in name.lower()
+        ][:MAX_CHOICES]
+
+        logger.debug(f"[Autocomplete] snapshot_autocomplete: {len(filtered)} matches for '{current}'")
+        return filtered
+
+    except Exception as e:
+        logger.exception(f"[Autocomplete] Failed snapshot_autocomplete for input '{current}': {e}")
+        return []
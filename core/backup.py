@@ -0,0 +1,141 @@
+import os
+import gzip
+import time
+import shutil
+import sqlite3
+import asyncio
+import logging
+import tempfile
+
+from datetime import datetime
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "template-"
+SNAPSHOT_SUFFIX = ".db.gz"
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Backup Manager
+# ---------------------------------------------------------------------------------------------------------------------
+class BackupManager:
+    """Online snapshots of the live database, gzipped and rotated.
+
+    Snapshots are taken with VACUUM INTO on a worker thread. It reads one consistent WAL snapshot, so the
+    bot's writer keeps committing throughout and, unlike a step-wise backup from a second connection, those
+    commits never force the copy to start over. Restores use the backup API under the write lock.
+    """
+
+    def __init__(self, db, backup_dir, interval_hours=6.0, keep=7, pages_per_step=256, step_pause=0.01):
+        self.db = db
+        self.backup_dir = backup_dir
+        self.interval = interval_hours * 3600
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+        self.step_pause = step_pause
+
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run(), name="database-backup")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.snapshot()
+            except Exception as e:
+                logger.exception(f"Scheduled backup failed: {e}")
+
+    # -----------------------------------------------------------------------------------------------------------------
+    def list_snapshots(self):
+        """Snapshot file names, newest first."""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        names = [name for name in os.listdir(self.backup_dir)
+                 if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)]
+        return sorted(names, reverse=True)
+
+    def _copy(self, source_path, target_path):
+        source = sqlite3.connect(source_path)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target, pages=self.pages_per_step, sleep=self.step_pause)
+        finally:
+            target.close()
+            source.close()
+
+    def _snapshot(self):
+        os.makedirs(self.backup_dir, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        final_path = os.path.join(self.backup_dir, f"{SNAPSHOT_PREFIX}{stamp}{SNAPSHOT_SUFFIX}")
+
+        with tempfile.TemporaryDirectory(dir=self.backup_dir) as work_dir:
+            raw_path = os.path.join(work_dir, "snapshot.db")
+            source = sqlite3.connect(self.db.path)
+            try:
+                source.execute("VACUUM INTO ?", (raw_path,))
+            finally:
+                source.close()
+
+            partial_path = os.path.join(work_dir, "snapshot.db.gz")
+            with open(raw_path, "rb") as raw, gzip.open(partial_path, "wb", compresslevel=6) as packed:
+                shutil.copyfileobj(raw, packed)
+            os.replace(partial_path, final_path)
+
+        for old in self.list_snapshots()[self.keep:]:
+            os.remove(os.path.join(self.backup_dir, old))
+
+        return final_path
+
+    async def snapshot(self):
+        """Takes a compressed snapshot and returns its path."""
+        async with self._lock:
+            started = time.perf_counter()
+            path = await asyncio.to_thread(self._snapshot)
+            logger.info(f"Database snapshot written to {path} in {time.perf_counter() - started:.1f}s")
+            return path
+
+    # -----------------------------------------------------------------------------------------------------------------
+    def _restore(self, name):
+        snapshot_path = os.path.join(self.backup_dir, os.path.basename(name))
+        if not os.path.isfile(snapshot_path):
+            raise FileNotFoundError(f"No snapshot named {name}")
+
+        with tempfile.TemporaryDirectory(dir=self.backup_dir) as work_dir:
+            raw_path = os.path.join(work_dir, "restore.db")
+            with gzip.open(snapshot_path, "rb") as packed, open(raw_path, "wb") as raw:
+                shutil.copyfileobj(packed, raw)
+
+            check = sqlite3.connect(raw_path)
+            try:
+                result = check.execute("PRAGMA integrity_check").fetchone()[0]
+            finally:
+                check.close()
+            if result != "ok":
+                raise ValueError(f"Snapshot {name} failed integrity check: {result}")
+
+            # Copying into the live file through the backup API keeps WAL and open connections consistent
+            self._copy(raw_path, self.db.path)
+
+    async def restore(self, name):
+        """Replaces the live database contents with a snapshot. Caches built from it must be reloaded after."""
+        async with self._lock:
+            # Hold the writer so no write lands halfway through the restore
+            async with self.db.transaction():
+                await asyncio.to_thread(self._restore, name)
+            logger.warning(f"Database restored from snapshot {name}")
@@ -0,0 +1,80 @@
+import math
+import hashlib
+import logging
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Bloom Filter
+# ---------------------------------------------------------------------------------------------------------------------
+class BloomFilter:
+    """Fixed-size bit array answering "definitely not present" or "possibly present"."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        # Two 64-bit halves of one digest, combined (Kirsch-Mitzenmacher) into k positions
+        digest = hashlib.blake2b(str(value).encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Suggestion Blacklist
+# ---------------------------------------------------------------------------------------------------------------------
+class Blacklist:
+    """Users barred from /suggest, held in memory and written through to the blacklist table.
+
+    Lists below bloom_threshold are kept as a set, so every check is a set lookup. Larger lists are kept
+    only as a bloom filter: the common negative answer still needs no query, and possible positives are
+    confirmed against the table.
+    """
+
+    def __init__(self, db, bloom_threshold=100000, error_rate=0.01):
+        self.db = db
+        self.bloom_threshold = bloom_threshold
+        self.error_rate = error_rate
+        self._users = set()
+        self._bloom = None
+
+    async def load(self):
+        rows = await self.db.fetchall('SELECT user_id FROM blacklist')
+        if len(rows) >= self.bloom_threshold:
+            # Headroom so later additions don't push the false-positive rate up straight away
+            bloom = BloomFilter(len(rows) * 2, self.error_rate)
+            for (user_id,) in rows:
+                bloom.add(user_id)
+            self._bloom, self._users = bloom, set()
+        else:
+            self._bloom, self._users = None, {user_id for (user_id,) in rows}
+        logger.info(f"Loaded {len(rows)} blacklisted user(s){' into a bloom filter' if self._bloom else ''}")
+
+    async def contains(self, user_id):
+        if self._bloom is None:
+            return user_id in self._users
+        if user_id not in self._bloom:
+            return False
+        return await self.db.fetchone('SELECT 1 FROM blacklist WHERE user_id = ?', (user_id,)) is not None
+
+    async def add(self, user_id):
+        await self.db.write('INSERT OR IGNORE INTO blacklist (user_id) VALUES (?)', (user_id,))
+        if self._bloom is None:
+            self._users.add(user_id)
+        else:
+            self._bloom.add(user_id)
@@ -0,0 +1,82 @@
+import re
+import logging
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+_WITHOUT_ROWID = re.compile(r"\bWITHOUT\s+ROWID\s*;?\s*$", re.IGNORECASE)
+
+
+def quote_identifier(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Schema Catalogue
+# ---------------------------------------------------------------------------------------------------------------------
+class SchemaCatalogue:
+    """In-memory copy of sqlite_master: user tables with their DDL, indexes, triggers and estimated row counts.
+
+    Loaded at startup and reloaded lazily after invalidate(), which table admin commands and migrations call.
+    Row counts are estimates from sqlite_stat1, kept current by maintenance.analyze(), so no table is ever
+    scanned; they are None until ANALYZE has run once.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.tables = {}
+        self._stale = True
+
+    async def load(self):
+        rows = await self.db.fetchall(
+            "SELECT type, name, tbl_name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'"
+        )
+
+        tables = {}
+        for kind, name, table_name, sql in rows:
+            if kind == "table":
+                tables[name] = {"sql": sql, "indexes": [], "triggers": [], "rows": None,
+                                "without_rowid": bool(sql and _WITHOUT_ROWID.search(sql))}
+
+        for kind, name, table_name, sql in rows:
+            # Automatic indexes have no SQL; they come back with the table's own constraints
+            if kind in ("index", "trigger") and sql and table_name in tables:
+                tables[table_name]["indexes" if kind == "index" else "triggers"].append(sql)
+
+        estimates = await self._estimate_rows()
+        if estimates is not None:
+            for name, table in tables.items():
+                # ANALYZE writes no row for an empty table
+                table["rows"] = estimates.get(name, 0)
+
+        self.tables = tables
+        self._stale = False
+        logger.info(f"Catalogued {len(tables)} table(s)")
+
+    async def _estimate_rows(self):
+        # Keys are often snowflakes, so MAX(rowid) says nothing about size. The first number of every
+        # sqlite_stat1 row is the table's row count as of the last ANALYZE.
+        try:
+            rows = await self.db.fetchall("SELECT tbl, stat FROM sqlite_stat1")
+        except Exception:
+            # No ANALYZE has run on this database yet
+            return None
+        estimates = {}
+        for name, stat in rows:
+            count = int(stat.split()[0]) if stat else 0
+            estimates[name] = max(estimates.get(name, 0), count)
+        return estimates
+
+    async def ensure(self):
+        if self._stale:
+            await self.load()
+        return self.tables
+
+    def invalidate(self):
+        self._stale = True
+
+    async def table(self, name):
+        return (await self.ensure()).get(name)
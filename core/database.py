@@ -0,0 +1,233 @@
+import time
+import asyncio
+import logging
+import aiosqlite
+
+from contextlib import asynccontextmanager
+
+from core.instrumentation import add_phase
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Database Class
+# ---------------------------------------------------------------------------------------------------------------------
+class Database:
+    """Bot-wide pool of long-lived SQLite connections: one writer and a few read-only readers.
+
+    Small independent writes can go through write(), which group-commits them: a background task gathers
+    whatever is queued (up to batch_size, waiting at most batch_window seconds) into one transaction.
+    """
+
+    def __init__(self, path, readers=3, busy_timeout=5000, cached_statements=256, init_pragmas=(),
+                 batch_size=100, batch_window=0.005):
+        self.path = path
+        self.init_pragmas = init_pragmas
+        self.reader_count = max(1, readers)
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+
+        self._writer = None
+        self._write_lock = asyncio.Lock()
+        self._readers = []
+        self._idle_readers = None
+        self._pending_writes = None
+        self._write_task = None
+
+    @property
+    def is_open(self):
+        return self._writer is not None
+
+    async def _connect(self, read_only=False):
+        # sqlite3 keeps a per-connection LRU of prepared statements, so reusing the
+        # same connections lets repeated queries skip the prepare step entirely.
+        conn = await aiosqlite.connect(self.path, cached_statements=self.cached_statements)
+        await conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        if read_only:
+            await conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    async def open(self):
+        if self.is_open:
+            return
+
+        self._writer = await self._connect()
+        for pragma in self.init_pragmas:
+            await self._writer.execute(pragma)
+        async with self._writer.execute("PRAGMA journal_mode = WAL") as cursor:
+            mode = (await cursor.fetchone())[0]
+
+        self._idle_readers = asyncio.Queue()
+        for _ in range(self.reader_count):
+            conn = await self._connect(read_only=True)
+            self._readers.append(conn)
+            self._idle_readers.put_nowait(conn)
+
+        self._pending_writes = asyncio.Queue()
+        self._write_task = asyncio.create_task(self._run_writes(), name="database-writer")
+
+        logger.info(f"Opened database {self.path} (journal_mode={mode}, readers={self.reader_count})")
+
+    async def close(self):
+        if not self.is_open:
+            return
+
+        # Let the writer commit everything already queued before the connections go away
+        self._pending_writes.put_nowait(None)
+        await self._write_task
+        self._write_task = None
+        self._pending_writes = None
+
+        async with self._write_lock:
+            for conn in self._readers:
+                await conn.close()
+            self._readers.clear()
+            self._idle_readers = None
+
+            await self._writer.close()
+            self._writer = None
+
+        logger.info(f"Closed database {self.path}")
+
+    # -----------------------------------------------------------------------------------------------------------------
+    @asynccontextmanager
+    async def reader(self):
+        """Borrows a read-only connection from the pool."""
+        started = time.perf_counter()
+        conn = await self._idle_readers.get()
+        try:
+            yield conn
+        finally:
+            self._idle_readers.put_nowait(conn)
+            add_phase("db", time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Holds the writer connection for a block of statements and commits them together."""
+        started = time.perf_counter()
+        async with self._write_lock:
+            try:
+                yield self._writer
+                await self._writer.commit()
+            except BaseException:
+                await self._writer.rollback()
+                raise
+            finally:
+                add_phase("db", time.perf_counter() - started)
+
+    # -----------------------------------------------------------------------------------------------------------------
+    async def fetchone(self, sql, params=()):
+        async with self.reader() as conn:
+            async with conn.execute(sql, params) as cursor:
+                return await cursor.fetchone()
+
+    async def fetchall(self, sql, params=()):
+        async with self.reader() as conn:
+            async with conn.execute(sql, params) as cursor:
+                return await cursor.fetchall()
+
+    async def execute(self, sql, params=()):
+        """Runs a single write statement and commits it. Returns the number of affected rows."""
+        async with self.transaction() as conn:
+            async with conn.execute(sql, params) as cursor:
+                return cursor.rowcount
+
+    async def executemany(self, sql, seq_of_params):
+        async with self.transaction() as conn:
+            async with conn.executemany(sql, seq_of_params) as cursor:
+                return cursor.rowcount
+
+    # -----------------------------------------------------------------------------------------------------------------
+    async def write(self, sql, params=()):
+        """Queues one write statement for the next group commit. Returns its rowcount once committed."""
+        return await self.write_many([(sql, params)])
+
+    async def write_many(self, statements):
+        """Queues (sql, params) statements that must apply together, committed with the next group.
+
+        Returns the rowcount of the last statement. If any statement fails, none of them apply and the
+        error is raised here; other writes in the same group are unaffected.
+        """
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        self._pending_writes.put_nowait((statements, future))
+        try:
+            return await future
+        finally:
+            add_phase("db", time.perf_counter() - started)
+
+    async def _run_writes(self):
+        while True:
+            first = await self._pending_writes.get()
+            if first is None:
+                return
+            batch = [first]
+
+            deadline = time.monotonic() + self.batch_window
+            stopping = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._pending_writes.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._pending_writes.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._commit_batch(batch)
+            if stopping:
+                return
+
+    async def _commit_batch(self, batch):
+        results = []
+        try:
+            async with self.transaction() as conn:
+                await conn.execute("BEGIN")
+                for statements, future in batch:
+                    # A failed statement only undoes itself, so only multi-statement writes need a savepoint
+                    # to keep one caller's error from leaking into the rest of the group
+                    grouped = len(statements) > 1
+                    if grouped:
+                        await conn.execute("SAVEPOINT grouped_write")
+                    try:
+                        rowcount = 0
+                        for sql, params in statements:
+                            rowcount = (await conn.execute(sql, params)).rowcount
+                        if grouped:
+                            await conn.execute("RELEASE grouped_write")
+                        results.append((future, rowcount, None))
+                    except Exception as e:
+                        if not conn.in_transaction:
+                            # Errors such as SQLITE_FULL roll back the whole transaction
+                            raise
+                        if grouped:
+                            await conn.execute("ROLLBACK TO grouped_write")
+                            await conn.execute("RELEASE grouped_write")
+                        results.append((future, None, e))
+        except Exception as e:
+            logger.exception(f"Group commit of {len(batch)} write(s) failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, rowcount, error in results:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(rowcount)
+            else:
+                future.set_exception(error)
@@ -0,0 +1,138 @@
+import io
+import asyncio
+import logging
+import aiohttp
+
+from urllib.parse import urlparse
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class FetchError(Exception):
+    """A download was refused: bad URL, HTTP error, too large, or not the expected content."""
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Image Sniffing
+# ---------------------------------------------------------------------------------------------------------------------
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+
+
+def sniff_image(data):
+    """Returns the image format from the file's magic bytes, or None. Content-Type headers are not trusted."""
+    for signature, kind in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return kind
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def _downscale(data, kind, max_dimension, max_bytes):
+    """Shrinks a still image to fit max_dimension, re-encoding it until it is under max_bytes if possible."""
+    with Image.open(io.BytesIO(data)) as image:
+        image.thumbnail((max_dimension, max_dimension))
+        if kind == "png" or image.mode in ("RGBA", "LA", "P"):
+            attempts = [("PNG", {"optimize": True})]
+        else:
+            image = image.convert("RGB")
+            attempts = [("JPEG", {"quality": quality}) for quality in (90, 80, 70)]
+
+        for image_format, options in attempts:
+            buffer = io.BytesIO()
+            image.save(buffer, format=image_format, **options)
+            if buffer.tell() <= max_bytes:
+                break
+        return buffer.getvalue()
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# HTTP Fetcher
+# ---------------------------------------------------------------------------------------------------------------------
+class HttpFetcher:
+    """Bounded downloads of user-supplied URLs over one shared aiohttp session.
+
+    Every request has a total timeout, and bodies are streamed with a hard byte cap so a large or slow
+    response can neither fill memory nor hold a command open indefinitely.
+    """
+
+    def __init__(self, timeout=15.0, max_bytes=10 * 1024 * 1024):
+        self.timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=5.0)
+        self.max_bytes = max_bytes
+        self._session = None
+
+    def _get_session(self):
+        # Created lazily, since a ClientSession must be made inside the running loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def fetch(self, url, max_bytes=None):
+        """Downloads url and returns its body, raising FetchError past max_bytes."""
+        limit = max_bytes or self.max_bytes
+        if urlparse(url).scheme not in ("http", "https"):
+            raise FetchError("Only http and https URLs are supported")
+
+        try:
+            async with self._get_session().get(url) as response:
+                if response.status != 200:
+                    raise FetchError(f"Server responded with HTTP {response.status}")
+                if response.content_length is not None and response.content_length > limit:
+                    raise FetchError(f"File is larger than {limit // 1024} KB")
+
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    body.extend(chunk)
+                    if len(body) > limit:
+                        raise FetchError(f"File is larger than {limit // 1024} KB")
+                return bytes(body)
+        except asyncio.TimeoutError:
+            raise FetchError("Download timed out")
+        except aiohttp.ClientError as e:
+            raise FetchError(f"Download failed: {e}")
+
+    async def fetch_image(self, url, max_bytes=None, max_dimension=1024, target_bytes=None):
+        """Downloads an image, verified by its magic bytes.
+
+        Still images larger than max_dimension or target_bytes are downscaled in a worker thread when Pillow is
+        installed. Animated GIFs are returned as-is.
+        """
+        data = await self.fetch(url, max_bytes=max_bytes)
+        kind = sniff_image(data)
+        if kind is None:
+            raise FetchError("URL does not point to a PNG, JPEG, GIF or WebP image")
+
+        target = target_bytes or self.max_bytes
+        if Image is not None and kind != "gif":
+            try:
+                with Image.open(io.BytesIO(data)) as image:
+                    oversized = max(image.size) > max_dimension
+            except Exception as e:
+                raise FetchError(f"Could not read image: {e}")
+
+            if oversized or len(data) > target:
+                original = len(data)
+                data = await asyncio.to_thread(_downscale, data, kind, max_dimension, target)
+                logger.debug(f"Downscaled image from {original} to {len(data)} bytes")
+
+        return data
@@ -22,6 +22,9 @@ class BotCore(commands.Cog):
     async def on_ready(self):
         print(f'Logged on as {self.bot.user}...')
 
+        await self.bot.log_channels.build()
+        self.bot.stats.rebuild_members()
+
         activity_type, bio = await get_bio_settings()
         if not (activity_type and bio):
             logger.warning("No activity type or bio found in database.")
@@ -40,6 +43,39 @@ class BotCore(commands.Cog):
 
         await self.bot.change_presence(activity=activity)
 
+    # ---------------------------------------------------------------------------------------------------------------------
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.bot.log_channels.on_channel_changed(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.bot.log_channels.on_channel_changed(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        if before.name != after.name:
+            self.bot.log_channels.on_channel_changed(after)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.bot.log_channels.refresh(guild)
+        self.bot.stats.guild_added(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.bot.log_channels.forget(guild.id)
+        self.bot.stats.guild_removed(guild)
+
+    # Member events only arrive with the members intent; without it counts refresh on ready and guild changes
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.bot.stats.member_changed(member.guild, 1)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.bot.stats.member_changed(member.guild, -1)
+
 
 # ----------------------------------------------------------------------------------------------------------------------
 # Setup Function
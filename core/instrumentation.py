@@ -0,0 +1,150 @@
+import time
+import asyncio
+import logging
+import contextvars
+
+from bisect import bisect_left
+from collections import deque
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+# Name of the command or listener the current task is running, used to label slow callbacks
+current_operation = contextvars.ContextVar("current_operation", default=None)
+
+# Phase timings (seconds) of the app command handled by the current task; set by the command tree middleware
+current_timing = contextvars.ContextVar("current_timing", default=None)
+
+# Upper bounds in milliseconds; the last bucket catches everything slower
+DEFAULT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf"))
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Phase Accounting
+# ---------------------------------------------------------------------------------------------------------------------
+def add_phase(name, elapsed):
+    """Adds elapsed seconds to a phase of the command being handled, if any."""
+    timing = current_timing.get()
+    if timing is not None:
+        timing[name] = timing.get(name, 0.0) + elapsed
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Histogram
+# ---------------------------------------------------------------------------------------------------------------------
+class Histogram:
+    """Fixed-bucket latency histogram in milliseconds. Percentiles are reported as bucket upper bounds."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value_ms):
+        self.counts[bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+
+    def merge(self, other):
+        """Adds another histogram with the same buckets into this one."""
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Loop Monitor
+# ---------------------------------------------------------------------------------------------------------------------
+def _describe(handle):
+    callback = getattr(handle, "_callback", None)
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        return f"task {owner.get_name()}"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+class LoopMonitor:
+    """Optional event-loop instrumentation: loop lag and slow callbacks.
+
+    Enabled with INSTRUMENT_LOOP=1. It wraps asyncio's Handle._run to time every callback, which costs two
+    clock reads per callback, so it stays off unless someone is investigating.
+    """
+
+    def __init__(self, slow_callback_ms=100, probe_interval=0.5, keep_slow=50):
+        self.slow_callback_ms = slow_callback_ms
+        self.probe_interval = probe_interval
+        self.enabled = False
+
+        self.loop_lag = Histogram()
+        self.slow_callbacks = deque(maxlen=keep_slow)
+        self.slow_total = 0
+
+        self._probe = None
+        self._original_run = None
+
+    def install(self):
+        if self.enabled:
+            return
+        self.enabled = True
+
+        monitor = self
+        original_run = asyncio.events.Handle._run
+        self._original_run = original_run
+
+        def _timed_run(handle):
+            started = time.perf_counter()
+            original_run(handle)
+            elapsed = (time.perf_counter() - started) * 1000
+            if elapsed >= monitor.slow_callback_ms:
+                context = getattr(handle, "_context", None)
+                operation = context.get(current_operation) if context is not None else None
+                monitor.record_slow(operation or _describe(handle), elapsed)
+
+        asyncio.events.Handle._run = _timed_run
+
+        self._probe = asyncio.create_task(self._probe_lag(), name="loop-lag-probe")
+        logger.info(f"Event-loop instrumentation enabled (slow callback threshold {self.slow_callback_ms}ms)")
+
+    async def uninstall(self):
+        if not self.enabled:
+            return
+        asyncio.events.Handle._run = self._original_run
+        if self._probe is not None:
+            self._probe.cancel()
+        self.enabled = False
+
+    # -----------------------------------------------------------------------------------------------------------------
+    def record_slow(self, operation, elapsed_ms):
+        self.slow_total += 1
+        self.slow_callbacks.append((time.time(), operation, elapsed_ms))
+        logger.warning(f"Slow callback: {operation} blocked the event loop for {elapsed_ms:.0f}ms")
+
+    async def _probe_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.probe_interval
+            await asyncio.sleep(self.probe_interval)
+            self.loop_lag.observe(max(0.0, loop.time() - expected) * 1000)
@@ -0,0 +1,59 @@
+import os
+import time
+import asyncio
+import logging
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+CORE_EXTENSIONS = ["core.initialisation"]
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------------------------------------------------
+def resolve_manifest(cogs_dir="cogs"):
+    """Returns the extensions to load as ordered stages; extensions within a stage load concurrently.
+
+    Core extensions come first, then every cog in cogs_dir (cogs do not depend on one another).
+    """
+    cogs = sorted(
+        f"cogs.{filename[:-3]}" for filename in os.listdir(cogs_dir)
+        if filename.endswith(".py") and not filename.startswith("_")
+    )
+    return [CORE_EXTENSIONS, cogs]
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------------------------------------------------
+async def _load_one(bot, name):
+    started = time.perf_counter()
+    try:
+        await bot.load_extension(name)
+    except Exception as e:
+        logger.exception(f"Failed to load {name}: {e}")
+        return False
+    finally:
+        bot.load_timings[name] = (time.perf_counter() - started) * 1000
+    return True
+
+
+async def load_extensions(bot, stages):
+    """Loads each stage concurrently and records per-extension load times."""
+    if not hasattr(bot, "load_timings"):
+        bot.load_timings = {}
+
+    started = time.perf_counter()
+    loaded = []
+    for stage in stages:
+        results = await asyncio.gather(*(_load_one(bot, name) for name in stage))
+        loaded.extend(name for name, ok in zip(stage, results) if ok)
+
+    total = (time.perf_counter() - started) * 1000
+    timings = ", ".join(f"{name} {ms:.1f}ms" for name, ms in
+                        sorted(bot.load_timings.items(), key=lambda item: item[1], reverse=True))
+    logger.info(f"Loaded {len(loaded)} extension(s) in {total:.1f}ms ({timings})")
+    return loaded
@@ -0,0 +1,92 @@
+import logging
+import discord
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+FALLBACK_CHANNEL_NAME = "collector_logs"
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Log Channel Index
+# ---------------------------------------------------------------------------------------------------------------------
+class LogChannelIndex:
+    """Per-guild resolved log destination: the configured channel, else #collector_logs, else nothing.
+
+    Guilds without a log channel are stored as None, so they cost a single dict lookup as well.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._configured = {}
+        self._resolved = {}
+
+    async def build(self):
+        """Loads configured channels and resolves every guild the bot is in. Called from on_ready."""
+        try:
+            rows = await self.bot.db.fetchall('SELECT guild_id, log_channel_id FROM config')
+        except Exception as e:
+            logger.warning(f"Could not load log channels from config: {e}")
+            rows = []
+
+        self._configured = {}
+        for guild_id, channel_id in rows:
+            try:
+                self._configured[int(guild_id)] = int(channel_id) if channel_id else None
+            except (TypeError, ValueError):
+                logger.warning(f"Invalid log_channel_id for guild {guild_id}: {channel_id}")
+
+        self._resolved = {}
+        for guild in self.bot.guilds:
+            self.refresh(guild)
+
+        found = sum(1 for channel_id in self._resolved.values() if channel_id)
+        logger.info(f"Indexed log channels: {found} of {len(self._resolved)} guild(s) have one")
+
+    def refresh(self, guild):
+        configured = self._configured.get(guild.id)
+        channel = guild.get_channel(configured) if configured else None
+
+        if channel is None:
+            channel = discord.utils.get(guild.text_channels, name=FALLBACK_CHANNEL_NAME)
+
+        self._resolved[guild.id] = channel.id if channel else None
+
+    def forget(self, guild_id):
+        self._resolved.pop(guild_id, None)
+
+    def resolve(self, guild_id):
+        """Returns the log channel for a guild, or None."""
+        if not guild_id:
+            return None
+
+        if guild_id not in self._resolved:
+            guild = self.bot.get_guild(guild_id)
+            if guild is None:
+                return None
+            self.refresh(guild)
+
+        channel_id = self._resolved[guild_id]
+        return self.bot.get_channel(channel_id) if channel_id else None
+
+    async def set_log_channel(self, guild_id, channel_id):
+        """Writes the configured log channel for a guild (None clears it) and re-resolves the guild."""
+        await self.bot.db.execute('''
+            INSERT INTO config (guild_id, log_channel_id) VALUES (?, ?)
+            ON CONFLICT(guild_id) DO UPDATE SET log_channel_id = excluded.log_channel_id
+        ''', (guild_id, channel_id))
+        self._configured[guild_id] = channel_id
+
+        guild = self.bot.get_guild(guild_id)
+        if guild is not None:
+            self.refresh(guild)
+        else:
+            self.forget(guild_id)
+
+    # -----------------------------------------------------------------------------------------------------------------
+    def on_channel_changed(self, channel):
+        # Only text channels can be destinations; a deleted or renamed one may have been the resolved target
+        if isinstance(channel, discord.TextChannel) or self._resolved.get(channel.guild.id) == channel.id:
+            self.refresh(channel.guild)
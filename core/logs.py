@@ -0,0 +1,158 @@
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Formatting
+# ---------------------------------------------------------------------------------------------------------------------
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Rotation
+# ---------------------------------------------------------------------------------------------------------------------
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """Rotates when the file passes max_bytes or when rotate_seconds have elapsed, whichever comes first."""
+
+    def __init__(self, filename, max_bytes=0, backup_count=0, rotate_seconds=0, encoding=None):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        self.rotate_seconds = rotate_seconds
+        self.rollover_at = time.time() + rotate_seconds if rotate_seconds else None
+
+    def shouldRollover(self, record):
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        if self.rotate_seconds:
+            self.rollover_at = time.time() + self.rotate_seconds
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Rate Limiting
+# ---------------------------------------------------------------------------------------------------------------------
+class RateLimitFilter(logging.Filter):
+    """Caps how often any one log call site can emit, per logger.
+
+    limits maps a logger name (or parent name) to (count, seconds). Each call site gets that many records per
+    window; the rest are dropped and counted, and the next record let through notes how many were suppressed.
+    Errors always pass.
+    """
+
+    def __init__(self, limits):
+        super().__init__()
+        self.limits = dict(limits)
+        self._windows = {}
+
+    def _limit_for(self, name):
+        while name:
+            if name in self.limits:
+                return self.limits[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+        limit = self._limit_for(record.name)
+        if limit is None:
+            return True
+
+        count, seconds = limit
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= seconds:
+            suppressed = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.getMessage()} ({suppressed} similar message(s) suppressed)"
+                record.args = None
+            return True
+
+        if window[1] < count:
+            window[1] += 1
+            return True
+        window[2] += 1
+        return False
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Queueing
+# ---------------------------------------------------------------------------------------------------------------------
+class DeferredQueueHandler(QueueHandler):
+    """Queues records with their exception info intact, so formatting happens on the listener thread.
+
+    The stock prepare() formats the whole record (traceback included) on the caller's thread and drops
+    exc_info, which also leaves the listener's formatters nothing to put in a separate exception field.
+    Only the message arguments are merged here, since they may be mutated after the call returns.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Setup
+# ---------------------------------------------------------------------------------------------------------------------
+def setup_logging(path, level=logging.INFO, json_lines=False, max_bytes=10 * 1024 * 1024, backup_count=5,
+                  rotate_hours=24.0, rate_limits=None):
+    """Routes all logging through a queue so callers never wait on file or console I/O.
+
+    The root logger only gets a QueueHandler; a QueueListener thread does the formatting and writing.
+    Returns the listener, which is stopped (and flushed) at interpreter exit.
+    """
+    formatter = JsonFormatter() if json_lines else logging.Formatter(TEXT_FORMAT)
+
+    file_handler = SizeAndTimeRotatingFileHandler(path, max_bytes=max_bytes, backup_count=backup_count,
+                                                  rotate_seconds=int(rotate_hours * 3600), encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    if rate_limits:
+        # Filtering before the queue means suppressed records cost nothing further
+        queue_handler.addFilter(RateLimitFilter(rate_limits))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = QueueListener(queue_handler.queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_logging, listener)
+    return listener
+
+
+def stop_logging(listener):
+    """Drains the queue and stops the listener thread. Safe to call more than once."""
+    if listener._thread is not None:
+        listener.stop()
@@ -0,0 +1,118 @@
+import time
+import asyncio
+import logging
+
+from core.catalogue import quote_identifier
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Table Reset
+# ---------------------------------------------------------------------------------------------------------------------
+async def clear_table(db, name, chunk_size=5000, progress=None):
+    """Deletes every row in bounded chunks, committing and yielding to the loop between chunks.
+
+    Each chunk holds the write lock only briefly, so other commands keep running during a large reset.
+    Indexes and triggers are left in place (delete triggers fire per row). Returns the rows deleted.
+    """
+    table = quote_identifier(name)
+    total = 0
+    while True:
+        async with db.transaction() as conn:
+            async with conn.execute(
+                    f'DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} LIMIT ?)', (chunk_size,)
+            ) as cursor:
+                deleted = cursor.rowcount
+        total += deleted
+
+        if progress:
+            await progress(total)
+        if deleted < chunk_size:
+            break
+        await asyncio.sleep(0)
+
+    # Restart AUTOINCREMENT counters, as recreating the table would
+    try:
+        await db.execute("DELETE FROM sqlite_sequence WHERE name = ?", (name,))
+    except Exception:
+        pass
+
+    await analyze(db, name)
+    return total
+
+
+async def analyze(db, name=None, analysis_limit=1000):
+    """Refreshes sqlite_stat1 for one table, or all of them.
+
+    analysis_limit caps the rows examined per index, so this costs milliseconds even on multi-GB tables and
+    leaves row counts as estimates. Those estimates feed the query planner and the catalogue's row counts.
+    """
+    target = f" {quote_identifier(name)}" if name else ""
+    async with db.transaction() as conn:
+        await conn.executescript(f"PRAGMA analysis_limit = {int(analysis_limit)}; ANALYZE{target};")
+
+
+async def recreate_table(db, name, table):
+    """Drops and recreates a table from its catalogue entry, including its indexes and triggers."""
+    async with db.transaction() as conn:
+        await conn.execute("BEGIN")
+        await conn.execute(f'DROP TABLE IF EXISTS {quote_identifier(name)}')
+        await conn.execute(table["sql"])
+        for statement in table["indexes"] + table["triggers"]:
+            await conn.execute(statement)
+
+
+async def _auto_vacuum_mode(db):
+    # Asked of the writer: readers keep reporting the mode they saw when they opened, even after a VACUUM
+    async with db.transaction() as conn:
+        async with conn.execute("PRAGMA auto_vacuum") as cursor:
+            return (await cursor.fetchone())[0]
+
+
+async def enable_incremental_vacuum(db):
+    """One-off conversion of an existing database to auto_vacuum=INCREMENTAL. Returns False if already converted.
+
+    The mode can only change on a database with tables through a full VACUUM, which rewrites the whole file
+    and holds the write lock throughout, so this is left to an explicit owner command.
+    """
+    if await _auto_vacuum_mode(db) == 2:
+        return False
+
+    started = time.perf_counter()
+    async with db.transaction() as conn:
+        await conn.executescript("PRAGMA auto_vacuum = INCREMENTAL; VACUUM;")
+    logger.info(f"Converted database to auto_vacuum=INCREMENTAL in {time.perf_counter() - started:.1f}s")
+    return True
+
+
+async def incremental_vacuum(db, pages_per_step=2000):
+    """Returns free pages to the filesystem in small steps.
+
+    Only works on auto_vacuum=INCREMENTAL databases: new files are created that way, older ones need a single
+    enable_incremental_vacuum() first.
+    """
+    if await _auto_vacuum_mode(db) != 2:
+        logger.info("Skipping incremental vacuum: auto_vacuum is not INCREMENTAL, run /enable_vacuum once to convert")
+        return 0
+
+    initial = previous = None
+    while True:
+        free_pages = (await db.fetchone("PRAGMA freelist_count"))[0]
+        if initial is None:
+            initial = free_pages
+        if not free_pages or free_pages == previous:
+            break
+        previous = free_pages
+
+        async with db.transaction() as conn:
+            # sqlite3's execute() steps a statement without result rows only once, and this pragma frees a
+            # single page per step; executescript() runs it to completion
+            await conn.executescript(f"PRAGMA incremental_vacuum({int(pages_per_step)});")
+
+        await asyncio.sleep(0)
+
+    return initial - (free_pages or 0)
@@ -0,0 +1,88 @@
+import os
+import time
+import asyncio
+import logging
+import psutil
+
+from collections import deque
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# System Sampler
+# ---------------------------------------------------------------------------------------------------------------------
+class SystemSampler:
+    """Polls process and system metrics on a fixed interval into a ring buffer.
+
+    psutil calls run in a worker thread; readers only look at the buffer, so no syscalls happen on the
+    interaction path. Each sample is a dict with cpu, process_cpu, memory, rss_mb, loop_lag_ms, fds and tasks.
+    """
+
+    def __init__(self, interval=15.0, window=40):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+        self._process = psutil.Process(os.getpid())
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            # Prime the CPU counters: the first cpu_percent(None) call always reports 0.0
+            psutil.cpu_percent(None)
+            self._process.cpu_percent(None)
+            self._task = asyncio.create_task(self._run(), name="system-sampler")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # -----------------------------------------------------------------------------------------------------------------
+    def _read(self):
+        with self._process.oneshot():
+            sample = {
+                "cpu": psutil.cpu_percent(None),
+                "process_cpu": self._process.cpu_percent(None),
+                "memory": psutil.virtual_memory().percent,
+                "rss_mb": self._process.memory_info().rss / (1024 * 1024),
+                "fds": self._process.num_fds() if hasattr(self._process, "num_fds") else None,
+            }
+        return sample
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Sleep first: the primed CPU counters need a full interval to report anything meaningful
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            # How late the loop woke us up is a direct measure of how busy it is
+            lag = max(0.0, loop.time() - expected) * 1000
+
+            try:
+                sample = await asyncio.to_thread(self._read)
+            except Exception as e:
+                logger.warning(f"System sample failed: {e}")
+                continue
+
+            sample["loop_lag_ms"] = lag
+            sample["tasks"] = len(asyncio.all_tasks())
+            sample["time"] = time.time()
+            self.samples.append(sample)
+
+    # -----------------------------------------------------------------------------------------------------------------
+    def latest(self):
+        return self.samples[-1] if self.samples else None
+
+    def summary(self, key):
+        """Returns (min, avg, max) of one metric over the window, or None if nothing is sampled yet."""
+        values = [sample[key] for sample in self.samples if sample.get(key) is not None]
+        if not values:
+            return None
+        return min(values), sum(values) / len(values), max(values)
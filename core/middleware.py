@@ -0,0 +1,243 @@
+import os
+import math
+import time
+import asyncio
+import logging
+import discord
+
+from functools import wraps
+from aiohttp import web
+from discord import app_commands
+
+from core.instrumentation import Histogram, current_operation, current_timing, add_phase
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Command Metrics
+# ---------------------------------------------------------------------------------------------------------------------
+class CommandMetrics:
+    """Per-command, per-phase latency histograms.
+
+    histograms accumulate from startup, as Prometheus expects. recent() covers only the last window to
+    2 * window seconds: total latency also goes into a pair of histograms that rotate every window.
+    Everything runs on the event loop thread, so plain counters are safe without locks.
+    """
+
+    def __init__(self, window=300.0):
+        self.histograms = {}
+        self.errors = {}
+        self.rate_limited = {}
+
+        self.window = window
+        self._window_started = time.monotonic()
+        self._current = {}
+        self._previous = {}
+
+    def _rotate(self, now):
+        elapsed = now - self._window_started
+        if elapsed < self.window:
+            return
+        # After a whole idle window, the last one holds nothing recent either
+        self._previous = self._current if elapsed < 2 * self.window else {}
+        self._current = {}
+        self._window_started = now
+
+    def histogram(self, command, phase="total"):
+        key = (command, phase)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        return histogram
+
+    def record(self, command, timing, total_ms):
+        accounted = 0.0
+        for phase in ("ack", "db", "http"):
+            elapsed = timing.get(phase, 0.0) * 1000
+            accounted += elapsed
+            self.histogram(command, phase).observe(elapsed)
+        self.histogram(command, "other").observe(max(0.0, total_ms - accounted))
+        self.histogram(command, "total").observe(total_ms)
+
+        self._rotate(time.monotonic())
+        recent = self._current.get(command)
+        if recent is None:
+            recent = self._current[command] = Histogram()
+        recent.observe(total_ms)
+
+    def commands(self):
+        return sorted({command for command, _ in self.histograms})
+
+    def recent(self):
+        """Total-latency histograms per command, over the last window to 2 * window seconds."""
+        self._rotate(time.monotonic())
+        merged = {}
+        for window in (self._previous, self._current):
+            for command, histogram in window.items():
+                merged.setdefault(command, Histogram()).merge(histogram)
+        return merged
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP bot_command_latency_ms App command latency by phase, in milliseconds.",
+            "# TYPE bot_command_latency_ms histogram",
+        ]
+        for (command, phase), histogram in sorted(self.histograms.items()):
+            labels = f'command="{command}",phase="{phase}"'
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f'bot_command_latency_ms_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"bot_command_latency_ms_sum{{{labels}}} {histogram.total:.3f}")
+            lines.append(f"bot_command_latency_ms_count{{{labels}}} {histogram.count}")
+
+        lines.append("# HELP bot_command_errors_total App commands that raised an error.")
+        lines.append("# TYPE bot_command_errors_total counter")
+        for command, count in sorted(self.errors.items()):
+            lines.append(f'bot_command_errors_total{{command="{command}"}} {count}')
+
+        lines.append("# HELP bot_command_rate_limited_total App commands rejected by the rate limiter.")
+        lines.append("# TYPE bot_command_rate_limited_total counter")
+        for command, count in sorted(self.rate_limited.items()):
+            lines.append(f'bot_command_rate_limited_total{{command="{command}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Phase Timing Hooks
+# ---------------------------------------------------------------------------------------------------------------------
+def _timed(phase, func):
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        if current_timing.get() is None:
+            return await func(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            add_phase(phase, time.perf_counter() - started)
+    wrapper.__timed__ = True
+    return wrapper
+
+
+def install_phase_hooks(client):
+    """Attributes time spent acknowledging the interaction and in other Discord REST calls to the current command."""
+    for name in ("defer", "send_message", "edit_message", "send_modal"):
+        method = getattr(discord.InteractionResponse, name)
+        if not getattr(method, "__timed__", False):
+            setattr(discord.InteractionResponse, name, _timed("ack", method))
+
+    if not getattr(discord.Webhook.send, "__timed__", False):
+        discord.Webhook.send = _timed("http", discord.Webhook.send)
+
+    client.http.request = _timed("http", client.http.request)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Instrumented Command Tree
+# ---------------------------------------------------------------------------------------------------------------------
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """Command tree that rate-limits app commands and times each one from receipt to completion, split into phases."""
+
+    def __init__(self, client, **kwargs):
+        super().__init__(client, **kwargs)
+        self.metrics = CommandMetrics()
+        # A CommandRateLimiter, set in config
+        self.limiter = None
+        install_phase_hooks(client)
+        client.add_listener(self._on_completion, "on_app_command_completion")
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.command is None:
+            return True
+
+        # Autocomplete requests pass through here too, and must not spend the command's tokens
+        if self.limiter is not None and interaction.type == discord.InteractionType.application_command:
+            name = interaction.command.qualified_name
+            retry_after = self.limiter.check(name, interaction.user.id, interaction.guild_id)
+            if retry_after:
+                self.metrics.rate_limited[name] = self.metrics.rate_limited.get(name, 0) + 1
+                await interaction.response.send_message(
+                    f"You're using `/{name}` too quickly. Try again in {math.ceil(retry_after)}s.", ephemeral=True)
+                return False
+
+        current_operation.set(f"/{interaction.command.qualified_name}")
+        current_timing.set({"started": time.perf_counter()})
+        return True
+
+    def _finish(self, interaction, command):
+        timing = current_timing.get()
+        if timing is None or command is None:
+            return
+        total_ms = (time.perf_counter() - timing["started"]) * 1000
+        self.metrics.record(command.qualified_name, timing, total_ms)
+        current_timing.set(None)
+
+    async def _on_completion(self, interaction, command):
+        self._finish(interaction, command)
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError, /) -> None:
+        if interaction.command is not None:
+            name = interaction.command.qualified_name
+            self.metrics.errors[name] = self.metrics.errors.get(name, 0) + 1
+            self._finish(interaction, interaction.command)
+        await super().on_error(interaction, error)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Metrics Export
+# ---------------------------------------------------------------------------------------------------------------------
+class MetricsExporter:
+    """Publishes CommandMetrics in Prometheus text format to a file, a local HTTP port, or both."""
+
+    def __init__(self, metrics, path=None, port=None, interval=15.0):
+        self.metrics = metrics
+        self.path = path
+        self.port = port
+        self.interval = interval
+        self._task = None
+        self._runner = None
+
+    def _write(self, text):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        # Replace atomically so a scraper never reads a half-written file
+        os.replace(temp_path, self.path)
+
+    async def _write_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self._write, self.metrics.to_prometheus())
+            except Exception as e:
+                logger.warning(f"Failed to write metrics to {self.path}: {e}")
+
+    async def _handle(self, request):
+        return web.Response(text=self.metrics.to_prometheus(), content_type="text/plain", charset="utf-8")
+
+    async def start(self):
+        if self.path and self._task is None:
+            self._task = asyncio.create_task(self._write_loop(), name="metrics-writer")
+            logger.info(f"Writing command metrics to {self.path}")
+
+        if self.port and self._runner is None:
+            app = web.Application()
+            app.router.add_get("/metrics", self._handle)
+            self._runner = web.AppRunner(app)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, "127.0.0.1", self.port).start()
+            logger.info(f"Serving command metrics on http://127.0.0.1:{self.port}/metrics")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
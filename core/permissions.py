@@ -0,0 +1,96 @@
+import time
+import logging
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Permission Resolver
+# ---------------------------------------------------------------------------------------------------------------------
+class PermissionResolver:
+    """TTL cache of the permissions table: (guild_id, user_id) -> can_use_commands.
+
+    As in GuildSettingsCache, set() and invalidate() bump a generation, and a miss only caches what it read
+    if the generation is unchanged once the query returns, so a stale read can't overwrite a fresh write.
+    """
+
+    def __init__(self, db, ttl=300, max_entries=50000):
+        self.db = db
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._generations = {}
+        self._guild_generations = {}
+        self._epoch = 0
+
+    def _cached(self, key, now):
+        entry = self._entries.get(key)
+        if entry and entry[1] > now:
+            return entry[0]
+        return None
+
+    def _generation(self, key):
+        return self._epoch, self._guild_generations.get(key[0], 0), self._generations.get(key, 0)
+
+    def _store(self, key, allowed, now):
+        if len(self._entries) >= self.max_entries:
+            self._entries = {k: v for k, v in self._entries.items() if v[1] > now}
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+        self._entries[key] = (allowed, now + self.ttl)
+
+    async def resolve_many(self, guild_id, user_ids):
+        """Resolves several users of one guild with at most one query for the uncached ones."""
+        now = time.monotonic()
+        results = {}
+        missing = []
+
+        for user_id in set(user_ids):
+            allowed = self._cached((guild_id, user_id), now)
+            if allowed is None:
+                missing.append(user_id)
+            else:
+                results[user_id] = allowed
+
+        if missing:
+            generations = {user_id: self._generation((guild_id, user_id)) for user_id in missing}
+            placeholders = ", ".join("?" for _ in missing)
+            rows = await self.db.fetchall(
+                f'SELECT user_id, can_use_commands FROM permissions '
+                f'WHERE guild_id = ? AND user_id IN ({placeholders})',
+                (guild_id, *missing)
+            )
+            found = {user_id: bool(value) for user_id, value in rows}
+            for user_id in missing:
+                allowed = found.get(user_id, False)
+                if self._generation((guild_id, user_id)) == generations[user_id]:
+                    self._store((guild_id, user_id), allowed, now)
+                results[user_id] = allowed
+
+        return results
+
+    async def can_use_commands(self, guild_id, user_id):
+        return (await self.resolve_many(guild_id, [user_id]))[user_id]
+
+    def set(self, guild_id, user_id, allowed):
+        """Records a value that has just been written by /authorise or /unauthorise."""
+        key = (guild_id, user_id)
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._store(key, bool(allowed), time.monotonic())
+
+    def invalidate(self, guild_id=None, user_id=None):
+        if guild_id is None:
+            self._epoch += 1
+            self._generations.clear()
+            self._guild_generations.clear()
+            self._entries.clear()
+        elif user_id is None:
+            self._guild_generations[guild_id] = self._guild_generations.get(guild_id, 0) + 1
+            self._entries = {k: v for k, v in self._entries.items() if k[0] != guild_id}
+        else:
+            key = (guild_id, user_id)
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.pop(key, None)
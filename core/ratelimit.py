@@ -0,0 +1,104 @@
+import time
+import logging
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Token Bucket
+# ---------------------------------------------------------------------------------------------------------------------
+class TokenBucket:
+    """Holds up to capacity tokens, refilled continuously at capacity per period."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity, period, now):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def retry_after(self):
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Command Rate Limiter
+# ---------------------------------------------------------------------------------------------------------------------
+class CommandRateLimiter:
+    """Per-(command, user) and per-(command, guild) token buckets, checked before a command runs.
+
+    Limits are (uses, seconds). overrides maps a qualified command name to {"user": limit, "guild": limit};
+    a limit of None means unlimited. Buckets idle long enough to have refilled are swept periodically,
+    since a full bucket behaves exactly like a missing one.
+    """
+
+    def __init__(self, user_limit=(5, 10.0), guild_limit=(30, 10.0), overrides=None, exempt_users=(),
+                 idle_after=600.0, sweep_every=1000):
+        self.user_limit = user_limit
+        self.guild_limit = guild_limit
+        self.overrides = dict(overrides or {})
+        self.exempt_users = set(exempt_users)
+        # An evicted bucket must already be full again, so never evict sooner than the longest period
+        periods = [limit[1] for limit in (user_limit, guild_limit) if limit]
+        periods += [limit[1] for override in self.overrides.values() for limit in override.values() if limit]
+        self.idle_after = max([idle_after] + periods)
+        self.sweep_every = sweep_every
+
+        self._buckets = {}
+        self._checks = 0
+
+    def _limits(self, command):
+        override = self.overrides.get(command, {})
+        return override.get("user", self.user_limit), override.get("guild", self.guild_limit)
+
+    def _bucket(self, key, limit, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(limit[0], limit[1], now)
+        else:
+            bucket.refill(now)
+        return bucket
+
+    def check(self, command, user_id, guild_id=None):
+        """Takes a token from each applicable bucket. Returns 0.0 if allowed, else seconds until retry."""
+        if user_id in self.exempt_users:
+            return 0.0
+
+        now = time.monotonic()
+        self._checks += 1
+        if self._checks % self.sweep_every == 0:
+            self.sweep(now)
+
+        user_limit, guild_limit = self._limits(command)
+        buckets = []
+        if user_limit is not None:
+            buckets.append(self._bucket((command, "user", user_id), user_limit, now))
+        if guild_limit is not None and guild_id is not None:
+            buckets.append(self._bucket((command, "guild", guild_id), guild_limit, now))
+
+        # Only spend tokens when every bucket allows it, so a guild-level rejection costs the user nothing
+        retry_after = max((bucket.retry_after() for bucket in buckets), default=0.0)
+        if retry_after:
+            return retry_after
+        for bucket in buckets:
+            bucket.tokens -= 1
+        return 0.0
+
+    def sweep(self, now=None):
+        now = time.monotonic() if now is None else now
+        idle = [key for key, bucket in self._buckets.items() if now - bucket.updated > self.idle_after]
+        for key in idle:
+            del self._buckets[key]
+        if idle:
+            logger.debug(f"Evicted {len(idle)} idle rate-limit bucket(s), {len(self._buckets)} remain")
+
+    def __len__(self):
+        return len(self._buckets)
@@ -0,0 +1,165 @@
+import logging
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Schema Registry
+# ---------------------------------------------------------------------------------------------------------------------
+# Run by Database.open() ahead of journal_mode=WAL. They only take effect on a new file; existing databases are
+# converted once with /enable_vacuum (core.maintenance.enable_incremental_vacuum).
+PRAGMAS = (
+    "PRAGMA auto_vacuum = INCREMENTAL",
+)
+
+# (version, description, statements). Append new migrations; never edit one that has shipped.
+MIGRATIONS = [
+    (1, "initial tables", (
+        '''
+        CREATE TABLE IF NOT EXISTS customisation (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            value TEXT NOT NULL,
+            UNIQUE(guild_id, type)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS blacklist (
+            user_id INTEGER PRIMARY KEY
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS permissions (
+            guild_id INTEGER,
+            user_id INTEGER,
+            can_use_commands BOOLEAN DEFAULT 0,
+            PRIMARY KEY (guild_id, user_id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS config (
+            guild_id INTEGER PRIMARY KEY,
+            log_channel_id INTEGER
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS item_stats (
+            guild_id INTEGER PRIMARY KEY,
+            items_collected INTEGER NOT NULL DEFAULT 0,
+            items_destroyed INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS sync_state (
+            scope TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            synced_at TIMESTAMP
+        )
+        ''',
+    )),
+    # Lookups by (guild_id, type) already use the UNIQUE constraint's index; bio settings are read by type alone
+    (2, "customisation type index", (
+        'CREATE INDEX IF NOT EXISTS idx_customisation_type ON customisation(type)',
+    )),
+    # Running item totals for /stats, maintained by triggers so no caller has to remember to update them
+    (3, "item stats summary", (
+        '''
+        CREATE TABLE IF NOT EXISTS stats_summary (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+        ''',
+        '''
+        INSERT OR REPLACE INTO stats_summary (key, value)
+        SELECT 'items_collected', COALESCE(SUM(items_collected), 0) FROM item_stats
+        ''',
+        '''
+        INSERT OR REPLACE INTO stats_summary (key, value)
+        SELECT 'items_destroyed', COALESCE(SUM(items_destroyed), 0) FROM item_stats
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS item_stats_after_insert AFTER INSERT ON item_stats BEGIN
+            UPDATE stats_summary SET value = value + NEW.items_collected WHERE key = 'items_collected';
+            UPDATE stats_summary SET value = value + NEW.items_destroyed WHERE key = 'items_destroyed';
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS item_stats_after_update AFTER UPDATE ON item_stats BEGIN
+            UPDATE stats_summary SET value = value + NEW.items_collected - OLD.items_collected
+                WHERE key = 'items_collected';
+            UPDATE stats_summary SET value = value + NEW.items_destroyed - OLD.items_destroyed
+                WHERE key = 'items_destroyed';
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS item_stats_after_delete AFTER DELETE ON item_stats BEGIN
+            UPDATE stats_summary SET value = value - OLD.items_collected WHERE key = 'items_collected';
+            UPDATE stats_summary SET value = value - OLD.items_destroyed WHERE key = 'items_destroyed';
+        END
+        ''',
+    )),
+    # Accepted /suggest submissions; content_hash lets duplicate detection survive a restart
+    (4, "suggestions", (
+        '''
+        CREATE TABLE IF NOT EXISTS suggestions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            guild_id INTEGER,
+            title TEXT NOT NULL,
+            suggestion TEXT NOT NULL,
+            additional_info TEXT,
+            content_hash TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            message_id INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_suggestions_created_at ON suggestions(created_at)',
+    )),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Migration Runner
+# ---------------------------------------------------------------------------------------------------------------------
+async def get_version(db):
+    row = await db.fetchone("SELECT value FROM schema_meta WHERE key = 'version'")
+    return int(row[0]) if row else 0
+
+
+async def migrate(db):
+    """Brings the database up to SCHEMA_VERSION. Each migration runs in its own transaction."""
+    async with db.transaction() as conn:
+        await conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        ''')
+
+    current = await get_version(db)
+    pending = [migration for migration in MIGRATIONS if migration[0] > current]
+    if not pending:
+        logger.info(f"Database schema is up to date (version {current})")
+        return current
+
+    for version, description, statements in pending:
+        async with db.transaction() as conn:
+            # sqlite3 only opens a transaction implicitly before DML, so begin one for the DDL as well
+            await conn.execute("BEGIN")
+            for statement in statements:
+                await conn.execute(statement)
+            await conn.execute('''
+                INSERT INTO schema_meta (key, value) VALUES ('version', ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            ''', (str(version),))
+        logger.info(f"Applied schema migration {version}: {description}")
+
+    await db.execute("PRAGMA optimize")
+    return SCHEMA_VERSION
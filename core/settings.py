@@ -0,0 +1,103 @@
+import logging
+
+from collections import OrderedDict
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Guild Settings Cache
+# ---------------------------------------------------------------------------------------------------------------------
+class GuildSettingsCache:
+    """Write-through LRU cache of the customisation table, keyed by guild.
+
+    Each guild has a generation, bumped by set() and invalidate(). A miss only caches what it read if the
+    generation is unchanged once the query returns, so a write landing mid-read can't be overwritten by a
+    stale copy.
+    """
+
+    def __init__(self, db, max_guilds=10000):
+        self.db = db
+        self.max_guilds = max_guilds
+        self._guilds = OrderedDict()
+        self._generations = {}
+        self._epoch = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _generation(self, guild_id):
+        return self._epoch, self._generations.get(guild_id, 0)
+
+    def _bump(self, guild_id):
+        self._generations[guild_id] = self._generations.get(guild_id, 0) + 1
+
+    def _store(self, guild_id, settings):
+        self._guilds[guild_id] = settings
+        self._guilds.move_to_end(guild_id)
+        while len(self._guilds) > self.max_guilds:
+            self._guilds.popitem(last=False)
+            self.evictions += 1
+
+    async def preload(self):
+        """Bulk-loads customisation rows for up to max_guilds guilds."""
+        rows = await self.db.fetchall('SELECT guild_id, type, value FROM customisation')
+        loaded = {}
+        for guild_id, key, value in rows:
+            loaded.setdefault(guild_id, {})[key] = value
+
+        for guild_id, settings in list(loaded.items())[:self.max_guilds]:
+            self._store(guild_id, settings)
+
+        logger.info(f"Preloaded settings for {len(self._guilds)} guild(s)")
+
+    async def get_all(self, guild_id):
+        guild_id = int(guild_id)
+        settings = self._guilds.get(guild_id)
+        if settings is not None:
+            self.hits += 1
+            self._guilds.move_to_end(guild_id)
+            return settings
+
+        self.misses += 1
+        generation = self._generation(guild_id)
+        rows = await self.db.fetchall('SELECT type, value FROM customisation WHERE guild_id = ?', (guild_id,))
+        settings = {key: value for key, value in rows}
+        if self._generation(guild_id) == generation:
+            self._store(guild_id, settings)
+        return settings
+
+    async def get(self, guild_id, key, default=None):
+        return (await self.get_all(guild_id)).get(key, default)
+
+    def set(self, guild_id, key, value):
+        """Updates a cached guild in place after its row has been written."""
+        guild_id = int(guild_id)
+        self._bump(guild_id)
+        settings = self._guilds.get(guild_id)
+        if settings is not None:
+            settings[key] = value
+
+    def invalidate(self, guild_id=None):
+        if guild_id is None:
+            self._epoch += 1
+            self._generations.clear()
+            self._guilds.clear()
+        else:
+            guild_id = int(guild_id)
+            self._bump(guild_id)
+            self._guilds.pop(guild_id, None)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "guilds": len(self._guilds),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
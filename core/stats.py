@@ -0,0 +1,77 @@
+import logging
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Stats Aggregator
+# ---------------------------------------------------------------------------------------------------------------------
+class StatsAggregator:
+    """Running totals for /stats.
+
+    Item totals live in the stats_summary table, kept current by triggers on item_stats, and are mirrored
+    here. Guild and member counts are rebuilt on ready and then adjusted from gateway events.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.items_collected = 0
+        self.items_destroyed = 0
+        self.guild_count = 0
+        self.member_count = 0
+        self._guild_members = {}
+
+    async def load(self):
+        rows = await self.bot.db.fetchall('SELECT key, value FROM stats_summary')
+        totals = dict(rows)
+        self.items_collected = totals.get("items_collected", 0)
+        self.items_destroyed = totals.get("items_destroyed", 0)
+
+    async def resync(self):
+        """Recomputes the summary from item_stats, for when rows changed without firing the triggers."""
+        async with self.bot.db.transaction() as conn:
+            await conn.execute('''
+                UPDATE stats_summary SET value = (SELECT COALESCE(SUM(items_collected), 0) FROM item_stats)
+                WHERE key = 'items_collected'
+            ''')
+            await conn.execute('''
+                UPDATE stats_summary SET value = (SELECT COALESCE(SUM(items_destroyed), 0) FROM item_stats)
+                WHERE key = 'items_destroyed'
+            ''')
+        await self.load()
+
+    async def record_items(self, guild_id, collected=0, destroyed=0):
+        """Adds to a guild's item counters; the summary table follows through its triggers."""
+        await self.bot.db.execute('''
+            INSERT INTO item_stats (guild_id, items_collected, items_destroyed) VALUES (?, ?, ?)
+            ON CONFLICT(guild_id) DO UPDATE SET
+                items_collected = items_collected + excluded.items_collected,
+                items_destroyed = items_destroyed + excluded.items_destroyed
+        ''', (guild_id, collected, destroyed))
+        self.items_collected += collected
+        self.items_destroyed += destroyed
+
+    # -----------------------------------------------------------------------------------------------------------------
+    def rebuild_members(self):
+        self._guild_members = {guild.id: guild.member_count or 0 for guild in self.bot.guilds}
+        self.guild_count = len(self._guild_members)
+        self.member_count = sum(self._guild_members.values())
+
+    def guild_added(self, guild):
+        if guild.id not in self._guild_members:
+            self.guild_count += 1
+        self.member_count += (guild.member_count or 0) - self._guild_members.get(guild.id, 0)
+        self._guild_members[guild.id] = guild.member_count or 0
+
+    def guild_removed(self, guild):
+        if guild.id in self._guild_members:
+            self.guild_count -= 1
+            self.member_count -= self._guild_members.pop(guild.id)
+
+    def member_changed(self, guild, delta):
+        if guild.id in self._guild_members:
+            self._guild_members[guild.id] += delta
+            self.member_count += delta
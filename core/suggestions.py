@@ -0,0 +1,213 @@
+import re
+import time
+import asyncio
+import hashlib
+import logging
+
+from datetime import datetime, timezone
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def content_hash(*parts):
+    """Hash of the text with case, punctuation and spacing removed, so trivial edits still match."""
+    normalized = " ".join(" ".join(_NON_WORD.sub(" ", part or "").lower().split()) for part in parts)
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class DeliveryUnavailable(Exception):
+    """The suggestion channel or renderer isn't available yet, so nothing can be posted."""
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Suggestion Queue
+# ---------------------------------------------------------------------------------------------------------------------
+class SuggestionQueue:
+    """Accepts suggestions without blocking the modal, then saves and posts them from a background worker.
+
+    submit() is synchronous: it throttles each user to one suggestion per user_interval, drops text the same
+    user already sent within dedupe_window, and queues the rest. The worker records each suggestion in the
+    suggestions table and posts it to the channel, at most one message per send_interval, once the bot is
+    ready. While the channel or renderer is missing, records are held and retried every unavailable_delay
+    without using up an attempt. Rows still 'pending' (unsent at shutdown, or failed max_attempts times) are
+    queued again by load() at startup.
+
+    render is an async callable turning a record into channel.send() kwargs, set by the cog that owns the
+    suggestion embed.
+    """
+
+    def __init__(self, bot, channel_id, user_interval=300.0, dedupe_window=86400.0, send_interval=2.0,
+                 max_pending=500, max_attempts=3, unavailable_delay=30.0):
+        self.bot = bot
+        self.channel_id = channel_id
+        self.user_interval = user_interval
+        self.dedupe_window = dedupe_window
+        self.send_interval = send_interval
+        self.max_attempts = max_attempts
+        self.unavailable_delay = unavailable_delay
+        self.render = None
+
+        self._queue = asyncio.Queue(maxsize=max_pending)
+        self._worker = None
+        self._current = None
+        # Ids of saved suggestions currently queued or in flight, so load() doesn't queue them twice
+        self._queued_ids = set()
+        self._last_accepted = {}
+        self._recent = {}
+
+        self.accepted = 0
+        self.rejected = 0
+
+    async def load(self):
+        """Seeds duplicate detection from recent rows, and queues suggestions that were never posted."""
+        rows = await self.bot.db.fetchall('''
+            SELECT user_id, content_hash, CAST(strftime('%s', created_at) AS INTEGER) FROM suggestions
+            WHERE created_at >= datetime('now', ?)
+        ''', (f"-{int(self.dedupe_window)} seconds",))
+        offset = time.monotonic() - time.time()
+        self._recent, self._last_accepted = {}, {}
+        for user_id, digest, created in rows:
+            seen = created + offset
+            self._recent[(user_id, digest)] = seen
+            self._last_accepted[user_id] = max(self._last_accepted.get(user_id, seen), seen)
+
+        pending = await self.bot.db.fetchall('''
+            SELECT id, user_id, guild_id, title, suggestion, additional_info, content_hash, created_at
+            FROM suggestions WHERE status = 'pending' ORDER BY id
+        ''')
+        requeued = 0
+        for row in pending:
+            if row[0] in self._queued_ids or self._queue.full():
+                continue
+            self._queue.put_nowait({
+                "id": row[0], "user_id": row[1], "guild_id": row[2], "title": row[3], "suggestion": row[4],
+                "additional_info": row[5], "content_hash": row[6],
+                "created": datetime.fromisoformat(row[7]).replace(tzinfo=timezone.utc),
+            })
+            self._queued_ids.add(row[0])
+            requeued += 1
+        if requeued:
+            logger.info(f"Queued {requeued} pending suggestion(s) for delivery")
+
+    def channel(self):
+        return self.bot.get_channel(self.channel_id)
+
+    def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run(), name="suggestion-worker")
+
+    async def stop(self):
+        """Stops the worker and saves anything still queued as pending, unsent."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        # Records that already have an id are pending in the table and will be queued again by load()
+        pending = [self._current] if self._current else []
+        self._current = None
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._queued_ids.clear()
+        unsaved = [record for record in pending if record.get("id") is None]
+        for record in unsaved:
+            await self._save(record)
+        if unsaved:
+            logger.info(f"Saved {len(unsaved)} unsent suggestion(s) on shutdown")
+
+    # -----------------------------------------------------------------------------------------------------------------
+    def _prune(self, now):
+        self._recent = {key: seen for key, seen in self._recent.items() if now - seen < self.dedupe_window}
+        self._last_accepted = {user: seen for user, seen in self._last_accepted.items()
+                               if now - seen < self.user_interval}
+
+    def submit(self, record):
+        """Queues a suggestion. Returns None if accepted, otherwise the reason it was refused."""
+        now = time.monotonic()
+        if len(self._recent) > 10000:
+            self._prune(now)
+
+        user_id = record["user_id"]
+        digest = record["content_hash"]
+
+        last = self._last_accepted.get(user_id)
+        if last is not None and now - last < self.user_interval:
+            self.rejected += 1
+            wait = int(self.user_interval - (now - last)) + 1
+            return f"You can make another suggestion in {wait} second(s)."
+
+        seen = self._recent.get((user_id, digest))
+        if seen is not None and now - seen < self.dedupe_window:
+            self.rejected += 1
+            return "You have already made this suggestion."
+
+        if self._queue.full():
+            self.rejected += 1
+            return "Too many suggestions are waiting to be sent. Please try again later."
+
+        self._queue.put_nowait(record)
+        self._last_accepted[user_id] = now
+        self._recent[(user_id, digest)] = now
+        self.accepted += 1
+        return None
+
+    async def _save(self, record):
+        async with self.bot.db.transaction() as conn:
+            async with conn.execute('''
+                INSERT INTO suggestions (user_id, guild_id, title, suggestion, additional_info, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (record["user_id"], record["guild_id"], record["title"], record["suggestion"],
+                  record["additional_info"], record["content_hash"])) as cursor:
+                record["id"] = cursor.lastrowid
+
+    async def _run(self):
+        # Channels aren't cached until the gateway is ready, and records loaded at startup are queued before that
+        await self.bot.wait_until_ready()
+        while True:
+            self._current = record = await self._queue.get()
+            delay = self.send_interval
+            try:
+                if record.get("id") is None:
+                    await self._save(record)
+                    self._queued_ids.add(record["id"])
+                await self._post(record)
+                self._queued_ids.discard(record["id"])
+            except DeliveryUnavailable as e:
+                # Not the suggestion's fault, so it keeps its attempts and waits for the channel to come back
+                if self._queue.full():
+                    self._queued_ids.discard(record.get("id"))
+                else:
+                    self._queue.put_nowait(record)
+                logger.warning(f"Holding suggestion {record.get('id')}: {e}")
+                delay = self.unavailable_delay
+            except Exception as e:
+                record["attempts"] = record.get("attempts", 0) + 1
+                if record["attempts"] < self.max_attempts and not self._queue.full():
+                    logger.warning(f"Failed to post suggestion {record.get('id')}, will retry: {e}")
+                    self._queue.put_nowait(record)
+                else:
+                    # Still 'pending' in the table, so the next load() picks it up again
+                    self._queued_ids.discard(record.get("id"))
+                    logger.exception(f"Failed to post suggestion {record.get('id')}, left pending: {e}")
+            self._current = None
+            # A steady pace keeps a burst of suggestions well inside the channel's rate limit
+            await asyncio.sleep(delay)
+
+    async def _post(self, record):
+        channel = self.channel()
+        if channel is None or self.render is None:
+            raise DeliveryUnavailable(f"suggestion channel {self.channel_id} or renderer unavailable")
+
+        message = await channel.send(**await self.render(record))
+        await self.bot.db.execute(
+            "UPDATE suggestions SET status = 'posted', message_id = ? WHERE id = ?",
+            (message.id, record["id"])
+        )
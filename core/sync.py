@@ -0,0 +1,104 @@
+import time
+import asyncio
+import logging
+
+from contextlib import asynccontextmanager
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Logging Configuration
+# ---------------------------------------------------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------------------------------------------------
+# Sync Engine
+# ---------------------------------------------------------------------------------------------------------------------
+class SyncEngine:
+    """Runs per-guild command syncs concurrently, paced so bursts stay inside Discord's rate limits.
+
+    discord.py already waits on the per-route bucket headers for each request; the engine bounds how many
+    guild syncs are in flight and how fast new ones start, so a large run does not queue thousands of
+    requests behind a single bucket. Guild joins are collected for a short window and synced as one batch.
+    """
+
+    def __init__(self, sync_func, concurrency=5, max_per_second=5.0, join_delay=10.0):
+        self.sync_func = sync_func
+        self.concurrency = max(1, concurrency)
+        self.min_interval = 1.0 / max_per_second if max_per_second > 0 else 0.0
+        self.join_delay = join_delay
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._pace_lock = asyncio.Lock()
+        self._next_start = 0.0
+
+        self._pending_joins = {}
+        self._join_task = None
+
+    async def _pace(self):
+        async with self._pace_lock:
+            now = time.monotonic()
+            if self._next_start > now:
+                await asyncio.sleep(self._next_start - now)
+            self._next_start = max(now, self._next_start) + self.min_interval
+
+    @asynccontextmanager
+    async def _slot(self):
+        async with self._semaphore:
+            await self._pace()
+            yield
+
+    async def _sync_one(self, guild, force=False):
+        # sync_func enters the slot only around a real upload, so guilds skipped as unchanged are not paced
+        return await self.sync_func(guild=guild, force=force, gate=self._slot)
+
+    async def sync_many(self, guilds, progress=None, progress_every=25, force=False):
+        """Syncs every guild and returns (guilds_done, total_commands, guilds_skipped).
+
+        progress, if given, is awaited as progress(done, total, commands) every progress_every guilds.
+        """
+        guilds = list(guilds)
+        total = len(guilds)
+        done = 0
+        skipped = 0
+        total_commands = 0
+
+        tasks = [asyncio.create_task(self._sync_one(guild, force)) for guild in guilds]
+        for finished in asyncio.as_completed(tasks):
+            try:
+                count, was_skipped = await finished
+                total_commands += count
+                skipped += was_skipped
+            except Exception as e:
+                logger.exception(f"Guild sync failed: {e}")
+            done += 1
+
+            if progress and (done % progress_every == 0 or done == total):
+                try:
+                    await progress(done, total, total_commands)
+                except Exception as e:
+                    logger.warning(f"Sync progress update failed: {e}")
+
+        logger.info(f"Synced {total_commands} command(s) across {done} guild(s), {skipped} unchanged")
+        return done, total_commands, skipped
+
+    # -----------------------------------------------------------------------------------------------------------------
+    def schedule_join(self, guild):
+        """Queues a newly joined guild; joins arriving within join_delay are synced together."""
+        self._pending_joins[guild.id] = guild
+        if self._join_task is None or self._join_task.done():
+            self._join_task = asyncio.create_task(self._flush_joins(), name="sync-joins")
+
+    async def _flush_joins(self):
+        # Guilds that join while a batch is syncing are picked up by the next pass, since schedule_join
+        # will not start another task while this one is running
+        while self._pending_joins:
+            await asyncio.sleep(self.join_delay)
+            guilds = list(self._pending_joins.values())
+            self._pending_joins.clear()
+
+            logger.info(f"Syncing commands to {len(guilds)} newly joined guild(s)")
+            try:
+                # A guild the bot left and rejoined has lost its commands even if its stored fingerprint matches
+                await self.sync_many(guilds, force=True)
+            except Exception as e:
+                logger.exception(f"Join sync failed: {e}")